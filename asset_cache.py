@@ -0,0 +1,186 @@
+# Asset Cache
+# Loads, scales and rotates sprite images once, packs every result into a
+# single texture atlas and stores it on disk as raw RGBA pixels. Later
+# launches read the atlas back with one file read, skipping PNG decoding,
+# scaling and rotation entirely. The cache is rebuilt automatically when
+# a source file's size, mtime or requested variants change.
+#
+# A sprite spec is (name, path, (width, height), rotations): rotations > 1
+# bakes that many evenly spaced orientations of the scaled sprite (the
+# unrotated one included), available through Atlas.get_rotations().
+
+import hashlib
+import json
+import os
+import struct
+import time
+
+import pygame
+
+# --- Constants ---
+DEFAULT_CACHE_DIR = ".asset_cache"
+ATLAS_MAGIC = b"SGAT"
+ATLAS_VERSION = 1
+HEADER = struct.Struct("<4sBI")  # magic, version, manifest length
+MAX_ATLAS_WIDTH = 1024
+PADDING = 1
+
+
+class Atlas:
+    """Sprites cut from one atlas surface"""
+
+    def __init__(self, surface, manifest, from_cache, load_ms):
+        self.from_cache = from_cache
+        self.load_ms = load_ms
+        self.manifest = manifest
+        self._cut(surface)
+
+    def _cut(self, surface):
+        """Split the atlas surface into its sprites"""
+        self.surface = surface
+        self.sprites = {}
+        self.rotations = {}
+        for name, entry in self.manifest["sprites"].items():
+            frames = [surface.subsurface(rect) for rect in entry]
+            self.sprites[name] = frames[0]
+            self.rotations[name] = frames[1:]
+
+    def convert(self):
+        """Convert to the display's pixel format (needs the window open)"""
+        self._cut(self.surface.convert_alpha())
+
+    def get(self, name):
+        """Return the scaled sprite, or None if it wasn't loaded"""
+        return self.sprites.get(name)
+
+    def get_rotations(self, name):
+        """Return every baked orientation of a sprite, starting at 0 degrees"""
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            return []
+        return [sprite] + self.rotations[name]
+
+
+def cache_key(specs):
+    """Hash the specs together with each source file's size and mtime"""
+    parts = [str(ATLAS_VERSION)]
+    for name, path, size, rotations in specs:
+        stat = os.stat(path)
+        parts.append(f"{name}|{os.path.abspath(path)}|{size}|{rotations}|"
+                     f"{stat.st_size}|{stat.st_mtime_ns}")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def render_frames(path, size, rotations, convert=True):
+    """Load, scale and (optionally) rotate one source image"""
+    image = pygame.image.load(path)
+    if convert and pygame.display.get_surface() is not None:
+        image = image.convert_alpha()
+    image = pygame.transform.scale(image, size)
+    frames = [image]
+    for i in range(1, rotations):
+        frames.append(pygame.transform.rotate(image, 360 * i / rotations))
+    return frames
+
+
+def pack(frame_lists):
+    """Shelf-pack surfaces; return (atlas size, {name: [rect tuples]})"""
+    items = []
+    for name, frames in frame_lists.items():
+        for index, frame in enumerate(frames):
+            items.append((frame.get_height(), frame.get_width(), name, index))
+    items.sort(reverse=True)
+
+    # One shelf if everything fits in MAX_ATLAS_WIDTH, else wrap at that width
+    row = sum(w + PADDING for _, w, _, _ in items)
+    width = max(min(MAX_ATLAS_WIDTH, row), max((w for _, w, _, _ in items), default=0) + PADDING)
+    placed = {name: [None] * len(frames) for name, frames in frame_lists.items()}
+    x = y = shelf = 0
+    for h, w, name, index in items:
+        if x + w > width:
+            x = 0
+            y += shelf + PADDING
+            shelf = 0
+        placed[name][index] = (x, y, w, h)
+        x += w + PADDING
+        shelf = max(shelf, h)
+    return (width, y + shelf), placed
+
+
+def build_atlas(specs, convert=True):
+    """Render every spec and pack it into a new atlas surface"""
+    frame_lists = {name: render_frames(path, size, rotations, convert)
+                   for name, path, size, rotations in specs}
+    atlas_size, placed = pack(frame_lists)
+    surface = pygame.Surface(atlas_size, pygame.SRCALPHA, 32)
+    for name, frames in frame_lists.items():
+        for frame, rect in zip(frames, placed[name]):
+            surface.blit(frame, rect[:2])
+    return surface, {"size": list(atlas_size), "sprites": placed}
+
+
+def write_cache(path, key, surface, manifest):
+    """Store the atlas as header + JSON manifest + raw RGBA pixels"""
+    manifest = dict(manifest, key=key)
+    blob = json.dumps(manifest).encode()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, len(blob)))
+        f.write(blob)
+        f.write(pygame.image.tostring(surface, "RGBA"))
+    os.replace(tmp_path, path)
+
+
+def read_cache(path, key):
+    """Return (surface, manifest) from a cache file, or None if stale/missing/corrupt"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, length = HEADER.unpack_from(data)
+    if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+        return None
+    start = HEADER.size
+    try:
+        manifest = json.loads(data[start:start + length])
+        if manifest.get("key") != key or not isinstance(manifest.get("sprites"), dict):
+            return None
+        width, height = manifest["size"]
+        pixels = data[start + length:]
+        if len(pixels) != width * height * 4:
+            return None
+        return pygame.image.fromstring(pixels, (width, height), "RGBA"), manifest
+    except (ValueError, TypeError, KeyError, AttributeError, pygame.error):
+        return None  # a damaged cache is just rebuilt
+
+
+def load_atlas(specs, name="atlas", cache_dir=DEFAULT_CACHE_DIR, convert=True):
+    """Return an Atlas for the specs, using the on-disk cache when valid.
+
+    Each game should use its own name so their caches don't overwrite
+    each other. Raises pygame.error/OSError if a source image can't be read.
+    Pass convert=False off the main thread and call Atlas.convert() later.
+    """
+    start = time.perf_counter()
+    key = cache_key(specs)
+    path = os.path.join(cache_dir, f"{name}.atlas")
+
+    cached = read_cache(path, key)
+    from_cache = cached is not None
+    if cached:
+        surface, manifest = cached
+    else:
+        surface, manifest = build_atlas(specs, convert)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_cache(path, key, surface, manifest)
+        except OSError as e:
+            print(f"Could not write asset cache: {e}")
+
+    if convert and pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    load_ms = (time.perf_counter() - start) * 1000
+    return Atlas(surface, manifest, from_cache, load_ms)
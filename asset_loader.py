@@ -0,0 +1,134 @@
+# Background Asset Loader
+# Decodes images and sounds on a worker thread so the window opens and
+# the game starts right away. Finished assets wait in a queue until the
+# main thread calls poll() (once per frame), which runs each job's
+# on_ready callback there, so game globals and display surfaces are only
+# ever touched from the main thread. Until then the game draws its
+# rectangle fallbacks.
+#
+#   loader = AssetLoader()
+#   loader.add("sprites", load_atlas, specs, "game", convert=False,
+#              on_ready=use_sprites)
+#   loader.start()
+#   ...
+#   loader.poll()               # every frame
+#   loader.progress()           # 0.0 - 1.0
+
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+
+class AssetLoader:
+    """Runs load jobs on one background thread and publishes the results"""
+
+    def __init__(self, log=None):
+        self.log = log
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.total = 0
+        self.loaded = 0
+        self.failed = {}  # job name -> error message
+        self.timings = {}  # job name -> milliseconds spent loading
+        self.callbacks = {}
+        self.started_at = None
+        self.finished_at = None
+        self.thread = None
+
+    def add(self, name, load, *args, on_ready=None, **kwargs):
+        """Queue load(*args, **kwargs) before start(); on_ready(result) runs in poll()"""
+        self.total += 1
+        self.callbacks[name] = on_ready
+        self.jobs.put((name, load, args, kwargs))
+
+    def start(self):
+        """Start the worker thread"""
+        if self.thread is None:
+            self.started_at = time.perf_counter()
+            self.thread = threading.Thread(target=self._worker, name="asset-loader", daemon=True)
+            self.thread.start()
+
+    def _worker(self):
+        """Background thread: run jobs until the queue is empty"""
+        while True:
+            try:
+                name, load, args, kwargs = self.jobs.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            try:
+                result, error = load(*args, **kwargs), None
+            except Exception as e:  # a failed job must not stop the jobs behind it
+                result, error = None, str(e) or type(e).__name__
+            self.results.put((name, result, error, (time.perf_counter() - start) * 1000))
+
+    def poll(self):
+        """Publish finished jobs (main thread only); return how many"""
+        published = 0
+        while True:
+            try:
+                name, result, error, ms = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.timings[name] = ms
+            if error is None:
+                self.loaded += 1
+                callback = self.callbacks.get(name)
+                if callback:
+                    callback(result)
+                if self.log:
+                    self.log(f"Loaded {name} in {ms:.1f} ms (background)")
+            else:
+                self.failed[name] = error
+                print(f"Could not load {name}: {error}")
+            published += 1
+        if self.done() and self.finished_at is None and self.started_at is not None:
+            self.finished_at = time.perf_counter()
+        return published
+
+    def wait(self, timeout=None):
+        """Block until the worker is finished, then publish everything"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.poll()
+        return self.done()
+
+    def done(self):
+        """True once every job has been published"""
+        return self.loaded + len(self.failed) == self.total
+
+    def progress(self):
+        """Fraction of jobs published, 1.0 when there is nothing to load"""
+        if not self.total:
+            return 1.0
+        return (self.loaded + len(self.failed)) / self.total
+
+    def elapsed_ms(self):
+        """Time from start() until the last job was published (or until now)"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return (end - self.started_at) * 1000
+
+
+def load_sounds(specs, volume=0.5):
+    """Open the mixer and load every (name, path) that exists.
+
+    Returns {name: Sound}; empty if there is no audio device.
+    """
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Sound disabled: {e}")
+        return {}
+    sounds = {}
+    for name, path in specs:
+        if os.path.exists(path):
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+            sounds[name] = sound
+    return sounds
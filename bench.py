@@ -0,0 +1,256 @@
+# Benchmark Suite
+# Times the update, collision and draw hot paths of main.py and
+# main_tutorial5.py headless against synthetic scenes of 10 to 50,000
+# entities. Results can be saved as a baseline and later runs compared
+# against it to catch regressions.
+#
+#   python bench.py --save-baseline bench_baseline.json
+#   python bench.py --compare bench_baseline.json
+#   python bench.py --case t5.stars --sizes 100000
+
+import os
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+from time import perf_counter_ns
+
+import pygame
+
+import main_tutorial5 as game5
+from profiler import percentile
+
+try:
+    import main as game_main
+except (pygame.error, OSError, SystemExit):
+    game_main = None  # main.py couldn't start here (e.g. its assets are missing)
+
+# --- Constants ---
+DEFAULT_SIZES = [10, 100, 1000, 10000, 50000]
+DEFAULT_FRAMES = 30
+DEFAULT_TOLERANCE = 0.25  # allowed p50 slowdown before a case is flagged
+BULLETS_PER_ENEMY = 0.2
+
+
+# --- Synthetic Scenes ---
+def random_rects(rng, count, width, height, max_y):
+    """Return count rects scattered over the playfield above max_y"""
+    return [pygame.Rect(rng.randint(0, game5.SCREEN_WIDTH - width),
+                        rng.randint(0, max_y), width, height)
+            for _ in range(count)]
+
+
+def make_scene(n, seed=0):
+    """Build n enemies, n * BULLETS_PER_ENEMY bullets and a safe player rect"""
+    rng = random.Random(seed)
+    field = game5.SCREEN_HEIGHT - 200  # keep entities off the player
+    enemies = random_rects(rng, n, game5.ENEMY_WIDTH, game5.ENEMY_HEIGHT, field)
+    bullets = random_rects(rng, max(1, int(n * BULLETS_PER_ENEMY)),
+                           game5.BULLET_WIDTH, game5.BULLET_HEIGHT, field)
+    player = pygame.Rect(game5.SCREEN_WIDTH // 2 - game5.PLAYER_WIDTH // 2,
+                         game5.SCREEN_HEIGHT - game5.PLAYER_HEIGHT - 10,
+                         game5.PLAYER_WIDTH, game5.PLAYER_HEIGHT)
+    return player, enemies, bullets
+
+
+def to_container(rects):
+    """Copy rects into the container type chosen by ENTITY_BACKEND"""
+    container = game5.create_entity_container(max(1, len(rects)))
+    for rect in rects:
+        container.append(rect)
+    return container
+
+
+# --- Cases for main_tutorial5.py ---
+def t5_setup(n):
+    player, enemies, bullets = make_scene(n)
+    return {"player": player, "enemies": to_container(enemies),
+            "bullets": to_container(bullets)}
+
+
+def t5_collision(mode):
+    def run(scene):
+        game5.COLLISION_MODE = mode
+        game5.check_bullet_enemy_collision(scene["bullets"], scene["enemies"])
+    return run
+
+
+def t5_stars_setup(n):
+    return {"stars": game5.Starfield(game5.SCREEN_WIDTH, game5.SCREEN_HEIGHT,
+                                     [(1, n, game5.STAR_COLOR, 1)])}
+
+
+def t5_numpy_stars_setup(n):
+    return {"stars": game5.VectorStarfield(game5.SCREEN_WIDTH, game5.SCREEN_HEIGHT,
+                                           [(1, n, game5.STAR_COLOR, 1)], seed=0)}
+
+
+def t5_numpy_stars(scene):
+    scene["stars"].update()
+    scene["stars"].draw(game5.screen)
+
+
+def t5_draw(scene):
+    game5.draw_game(game5.screen, scene["player"], scene["enemies"], scene["bullets"],
+                    scene["stars"], 0, 0)
+
+
+def t5_draw_setup(n):
+    scene = t5_setup(n)
+    scene["stars"] = game5.create_stars()
+    return scene
+
+
+# --- Cases for main.py ---
+def main_setup(n):
+    player, enemies, bullets = make_scene(n)
+    rng = random.Random(1)
+    game_main.player_rect.update(player)
+    game_main.enemies = enemies
+    game_main.bullets = bullets
+    game_main.stars = [[rng.randrange(game_main.SCREEN_WIDTH), rng.randrange(game_main.SCREEN_HEIGHT)]
+                       for _ in range(n)]
+    return {}
+
+
+def main_collision(mode):
+    def run(scene):
+        game_main.COLLISION_MODE = mode
+        game_main.handle_collisions()
+    return run
+
+
+# name -> (module, setup, run, rebuild scene every frame, largest size)
+CASES = {
+    "t5.collision.hash": ("main_tutorial5", t5_setup, t5_collision("hash"), True, None),
+    "t5.collision.sap": ("main_tutorial5", t5_setup, t5_collision("sap"), True, None),
+    "t5.collision.brute": ("main_tutorial5", t5_setup, t5_collision("brute"), True, 1000),
+    "t5.player_collision": ("main_tutorial5", t5_setup,
+                            lambda s: game5.check_player_enemy_collision(s["player"], s["enemies"]),
+                            False, None),
+    "t5.update_enemies": ("main_tutorial5", t5_setup,
+                          lambda s: game5.update_enemies(s["enemies"]), True, None),
+    "t5.update_bullets": ("main_tutorial5", t5_setup,
+                          lambda s: game5.update_bullets(s["bullets"]), True, None),
+    "t5.update_stars": ("main_tutorial5", t5_stars_setup,
+                        lambda s: game5.update_stars(s["stars"]), False, None),
+    "t5.stars.numpy": ("main_tutorial5", t5_numpy_stars_setup, t5_numpy_stars, False, None),
+    "t5.draw_game": ("main_tutorial5", t5_draw_setup, t5_draw, False, None),
+    "main.collision.hash": ("main", main_setup, main_collision("hash"), True, None),
+    "main.collision.brute": ("main", main_setup, main_collision("brute"), True, 1000),
+    "main.move_objects": ("main", main_setup, lambda s: game_main.move_objects(), True, None),
+    "main.update_stars": ("main", main_setup, lambda s: game_main.update_stars(), False, None),
+    "main.draw_screen": ("main", main_setup, lambda s: game_main.draw_screen(), False, None),
+}
+
+
+# --- Running ---
+def time_case(setup, run, rebuild, n, frames):
+    """Return the per-frame timings (ns) of one case at one size"""
+    timings = []
+    scene = setup(n)
+    for _ in range(frames):
+        if rebuild:
+            scene = setup(n)
+        start = perf_counter_ns()
+        run(scene)
+        timings.append(perf_counter_ns() - start)
+    return timings
+
+
+def summarize(timings):
+    """Reduce raw timings to ops/sec and latency percentiles in ms"""
+    mean = sum(timings) / len(timings)
+    return {
+        "ops_per_sec": 1e9 / mean if mean else 0.0,
+        "mean_ms": mean / 1e6,
+        "p50_ms": percentile(timings, 0.50) / 1e6,
+        "p95_ms": percentile(timings, 0.95) / 1e6,
+        "p99_ms": percentile(timings, 0.99) / 1e6,
+    }
+
+
+def run_suite(sizes, frames, selected=None):
+    """Run every (or every selected) case and return {case: {size: summary}}"""
+    results = {}
+    for name, (module, setup, run, rebuild, max_n) in CASES.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        if setup is t5_numpy_stars_setup and game5.VectorStarfield is None:
+            print(f"{name}: skipped (NumPy is not installed)")
+            continue
+        if module == "main" and game_main is None:
+            print(f"{name}: skipped (main.py failed to import)")
+            continue
+        results[name] = {}
+        for n in sizes:
+            if max_n is not None and n > max_n:
+                continue
+            summary = summarize(time_case(setup, run, rebuild, n, frames))
+            results[name][str(n)] = summary
+            print(f"{name:<22} n={n:<6} {summary['ops_per_sec']:>10.1f} ops/s  "
+                  f"p50 {summary['p50_ms']:8.3f} ms  p99 {summary['p99_ms']:8.3f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages (p50 slower than the tolerance)"""
+    regressions = []
+    for name, sizes in results.items():
+        for n, summary in sizes.items():
+            old = baseline.get(name, {}).get(n)
+            if not old or not old["p50_ms"]:
+                continue
+            ratio = summary["p50_ms"] / old["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name} n={n}: p50 {old['p50_ms']:.3f} -> "
+                                   f"{summary['p50_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths headless")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="timed frames per size")
+    parser.add_argument("--backend", choices=["pool", "list", "numpy"], default=game5.ENTITY_BACKEND,
+                        help="entity container used for the main_tutorial5 cases")
+    parser.add_argument("--case", action="append", help="only run cases starting with this name")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    game5.ENTITY_BACKEND = args.backend
+    game5.init_game()
+    # Measure with the sprites in place, not the fallback shapes
+    game5.asset_loader.wait()
+    if game_main is not None:
+        game_main.init_game()
+        game_main.asset_loader.wait()
+    results = run_suite(args.sizes, args.frames, args.case)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "backend": args.backend,
+                       "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Dirty Rectangle Renderer
+# Pushes only the parts of the screen that changed to the display instead
+# of flipping the whole window. Each frame the draw code marks the bounds
+# of everything it drew; the damaged area is this frame's rects plus last
+# frame's (so moved objects get erased at their old position).
+
+import pygame
+
+# --- Constants ---
+# Fall back to a full flip when the damage covers more than this fraction
+# of the screen (many small updates cost more than one big one)
+DEFAULT_FULL_FLIP_THRESHOLD = 0.5
+
+
+def merge_rects(rects):
+    """Merge overlapping rects into their unions (single greedy pass)"""
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        if index == -1:
+            merged.append(rect.copy())
+        else:
+            merged[index].union_ip(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Collects damaged rects during a frame and presents them"""
+
+    def __init__(self, screen_size, threshold=DEFAULT_FULL_FLIP_THRESHOLD):
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.threshold = threshold
+        self.previous = []
+        self.current = []
+        self.force_full = True
+
+        # Stats
+        self.frames = 0
+        self.full_flips = 0
+
+    def mark(self, rect):
+        """Record that rect was drawn this frame (the rect is copied)"""
+        self.current.append(pygame.Rect(rect))
+
+    def invalidate(self):
+        """Force the next present() to flip the whole screen"""
+        self.force_full = True
+
+    def present(self):
+        """Push this frame's damaged regions (or everything) to the display"""
+        self.frames += 1
+        damaged = merge_rects(self.previous + self.current)
+        damaged = [rect.clip(self.screen_rect) for rect in damaged]
+        damaged = [rect for rect in damaged if rect.width and rect.height]
+        area = sum(rect.width * rect.height for rect in damaged)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+
+        if self.force_full or area > screen_area * self.threshold:
+            pygame.display.flip()
+            self.full_flips += 1
+            self.force_full = False
+        elif damaged:
+            pygame.display.update(damaged)
+
+        self.previous = self.current
+        self.current = []
@@ -0,0 +1,166 @@
+# Entity Store
+# Structure-of-arrays container for enemies/bullets backed by NumPy.
+# Movement, off-screen culling and overlap tests run as whole-array
+# operations; iterating the store yields pygame.Rect objects so the
+# draw code can keep treating it like a list of rects.
+
+import numpy as np
+import pygame
+
+# --- Constants ---
+DEFAULT_CAPACITY = 256
+
+
+class EntityStore:
+    """Contiguous x/y/w/h/alive arrays for a group of axis-aligned boxes.
+
+    Supports the same container protocol as a plain list of rects for the
+    game functions: append(rect), spawn(x, y, w, h), len(), iteration,
+    scroll(dy, ...), any_collide(rect) and remove_indices(indices).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping live entries"""
+        old = self.count
+        x = np.zeros(capacity, dtype=np.float64)
+        y = np.zeros(capacity, dtype=np.float64)
+        w = np.zeros(capacity, dtype=np.float64)
+        h = np.zeros(capacity, dtype=np.float64)
+        alive = np.zeros(capacity, dtype=bool)
+        if old:
+            x[:old] = self.x[:old]
+            y[:old] = self.y[:old]
+            w[:old] = self.w[:old]
+            h[:old] = self.h[:old]
+            alive[:old] = self.alive[:old]
+        self.x, self.y, self.w, self.h, self.alive = x, y, w, h, alive
+        self.capacity = capacity
+
+    # --- Adding and removing ---
+    def spawn(self, x, y, w, h):
+        """Add one entity and return its index"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.w[i] = w
+        self.h[i] = h
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def append(self, rect):
+        """List-compatible add from a pygame.Rect"""
+        self.spawn(rect.x, rect.y, rect.width, rect.height)
+
+    def kill(self, indices):
+        """Mark entities dead; call compact() to reclaim their slots"""
+        self.alive[np.asarray(list(indices), dtype=np.intp)] = False
+
+    def compact(self):
+        """Pack live entities to the front of the arrays, keeping order"""
+        n = self.count
+        keep = self.alive[:n]
+        if keep.all():
+            return
+        live = int(keep.sum())
+        for arr in (self.x, self.y, self.w, self.h):
+            arr[:live] = arr[:n][keep]
+        self.alive[:live] = True
+        self.alive[live:n] = False
+        self.count = live
+
+    def remove_indices(self, indices):
+        """Remove the given indices (used by the collision code)"""
+        if indices:
+            self.kill(indices)
+            self.compact()
+
+    def clear(self):
+        """Remove every entity"""
+        self.alive[:self.count] = False
+        self.count = 0
+
+    # --- Vectorized updates ---
+    def scroll(self, dy, top_limit=None, bottom_limit=None):
+        """Move every entity by dy, then drop the ones that left the screen.
+
+        Entities whose top is below bottom_limit, or whose bottom is above
+        top_limit, are removed.
+        """
+        n = self.count
+        if not n:
+            return
+        y = self.y[:n]
+        y += dy
+        gone = np.zeros(n, dtype=bool)
+        if bottom_limit is not None:
+            gone |= y > bottom_limit
+        if top_limit is not None:
+            gone |= (y + self.h[:n]) < top_limit
+        if gone.any():
+            self.alive[:n] &= ~gone
+            self.compact()
+
+    def overlaps(self, rect):
+        """Boolean mask of live entities overlapping rect (Rect.colliderect rules)"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        return ((x < rect.right) & (x + self.w[:n] > rect.left) &
+                (y < rect.bottom) & (y + self.h[:n] > rect.top))
+
+    def any_collide(self, rect):
+        """True if any entity overlaps rect"""
+        return bool(self.count) and bool(self.overlaps(rect).any())
+
+    # --- Snapshots ---
+    def positions(self):
+        """x, y of every live entity as a flat int32 array"""
+        n = self.count
+        coords = np.empty((n, 2), dtype=np.int32)
+        coords[:, 0] = self.x[:n]
+        coords[:, 1] = self.y[:n]
+        return coords.ravel()
+
+    def load_positions(self, coords, w, h):
+        """Make the live entities exactly the given flat x, y pairs"""
+        coords = np.frombuffer(coords, dtype=np.int32).reshape(-1, 2)
+        n = len(coords)
+        if n > self.capacity:
+            self._allocate(max(n, self.capacity * 2))
+        self.x[:n] = coords[:, 0]
+        self.y[:n] = coords[:, 1]
+        self.w[:n] = w
+        self.h[:n] = h
+        self.alive[:n] = True
+        self.alive[n:self.count] = False
+        self.count = n
+
+    # --- Rect adapter ---
+    def rect(self, i):
+        """Return entity i as a new pygame.Rect"""
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("entity index out of range")
+        return self.rect(i)
+
+    def __iter__(self):
+        """Yield a Rect per live entity (snapshot of the current frame)"""
+        n = self.count
+        coords = zip(self.x[:n].astype(int).tolist(), self.y[:n].astype(int).tolist(),
+                     self.w[:n].astype(int).tolist(), self.h[:n].astype(int).tolist())
+        for x, y, w, h in coords:
+            yield pygame.Rect(x, y, w, h)
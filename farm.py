@@ -0,0 +1,122 @@
+# Simulation Farm
+# Plays many headless games across a process pool, one parameter set per
+# combination of the values given on the command line, and reports how
+# long a bot survives, what it scores and what each tick costs. Every
+# parameter set is played with the same game seeds so results compare fairly.
+#
+#   python farm.py --enemy-speed 2 3 4 --spawn-min 15 20 --games 50 --bot aim
+
+import os
+
+# Must be set before pygame is imported by the worker processes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import statistics
+
+import headless
+
+game = headless.game
+
+# --- Constants ---
+# Tunable game constants and the command-line flag for each
+PARAMETERS = {
+    "ENEMY_SPEED": "enemy_speed",
+    "BULLET_SPEED": "bullet_speed",
+    "PLAYER_SPEED": "player_speed",
+    "SPAWN_RATE_START": "spawn_start",
+    "SPAWN_RATE_MIN": "spawn_min",
+    "SPAWN_RATE_DIVISOR": "spawn_divisor",
+}
+
+
+def run_job(job):
+    """Worker: play one game with one parameter set and return its result"""
+    set_index, params, seed, bot, max_ticks = job
+    for name, value in params.items():
+        setattr(game, name, value)
+    policy = headless.make_policy(bot, seed)
+    result = headless.run_headless(max_ticks, policy, game.GameState(seed))
+    result["set"] = set_index
+    return result
+
+
+def parameter_sets(args):
+    """Cartesian product of every value given for every parameter"""
+    names = list(PARAMETERS)
+    values = [getattr(args, PARAMETERS[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def summarize(params, results):
+    """Aggregate one parameter set's games into a report row"""
+    ticks = [r["ticks"] for r in results]
+    scores = [r["score"] for r in results]
+    tick_cost = [r["seconds"] / r["ticks"] * 1e6 for r in results if r["ticks"]]
+    row = dict(params)
+    row.update({
+        "games": len(results),
+        "survival_s_mean": statistics.mean(ticks) / game.SIM_RATE,
+        "survival_s_median": statistics.median(ticks) / game.SIM_RATE,
+        "score_mean": statistics.mean(scores),
+        "score_max": max(scores),
+        "timeouts": sum(1 for r in results if not r["game_over"]),
+        "tick_us_mean": statistics.mean(tick_cost) if tick_cost else 0.0,
+        "tick_us_max": max(tick_cost) if tick_cost else 0.0,
+    })
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless balancing games on every core")
+    for name, flag in PARAMETERS.items():
+        default = getattr(game, name)
+        parser.add_argument("--" + flag.replace("_", "-"), dest=flag, type=int, nargs="+",
+                            default=[default], help=f"values for {name} (default {default})")
+    parser.add_argument("--games", type=int, default=20, help="games per parameter set")
+    parser.add_argument("--max-ticks", type=int, default=game.SIM_RATE * 600, help="tick limit per game")
+    parser.add_argument("--bot", choices=headless.BOTS, default="aim")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--out", metavar="PATH", help="also write the report to .json or .csv")
+    args = parser.parse_args()
+
+    sets = parameter_sets(args)
+    jobs = [(i, params, args.seed + g, args.bot, args.max_ticks)
+            for i, params in enumerate(sets) for g in range(args.games)]
+    print(f"{len(sets)} parameter sets x {args.games} games on {args.processes} processes")
+
+    results = [[] for _ in sets]
+    with multiprocessing.Pool(args.processes) as pool:
+        chunk = max(1, len(jobs) // (args.processes * 4))
+        for result in pool.imap_unordered(run_job, jobs, chunksize=chunk):
+            results[result["set"]].append(result)
+
+    report = [summarize(params, set_results) for params, set_results in zip(sets, results)]
+    report.sort(key=lambda row: row["survival_s_mean"], reverse=True)
+
+    for row in report:
+        params = " ".join(f"{name}={row[name]}" for name in PARAMETERS)
+        print(f"{params}\n    survival {row['survival_s_mean']:7.1f}s (median {row['survival_s_median']:.1f}s)"
+              f"  score {row['score_mean']:7.1f} (max {row['score_max']})"
+              f"  tick {row['tick_us_mean']:6.1f} us  timeouts {row['timeouts']}")
+
+    if args.out:
+        if args.out.endswith(".json"):
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            with open(args.out, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(report[0]))
+                writer.writeheader()
+                writer.writerows(report)
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
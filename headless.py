@@ -0,0 +1,107 @@
+# Headless Simulation Runner
+# Runs the Tutorial 5 simulation without a window (SDL dummy video driver)
+# and as fast as the CPU allows, for load tests, bots and replays.
+#
+#   python headless.py --ticks 100000 --games 5
+
+import os
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+import main_tutorial5 as game
+
+
+def idle_policy(state):
+    """Never press anything"""
+    return 0
+
+
+def make_random_policy(seed=None, fire_chance=0.2):
+    """Return a policy that wanders left/right and fires at random"""
+    rng = random.Random(seed)
+    moves = (0, game.INPUT_LEFT, game.INPUT_RIGHT)
+
+    def policy(state):
+        inputs = rng.choice(moves)
+        if rng.random() < fire_chance:
+            inputs |= game.INPUT_FIRE
+        return inputs
+
+    return policy
+
+
+def make_aim_policy(fire_every=6):
+    """Return a policy that lines up under the lowest enemy and keeps firing"""
+    def policy(state):
+        player = state.player_rect
+        inputs = game.INPUT_FIRE if state.tick % fire_every == 0 else 0
+        target = None
+        for enemy in state.enemies:
+            if target is None or enemy.bottom > target.bottom:
+                target = enemy
+        if target is not None:
+            if target.centerx < player.centerx - game.PLAYER_SPEED:
+                inputs |= game.INPUT_LEFT
+            elif target.centerx > player.centerx + game.PLAYER_SPEED:
+                inputs |= game.INPUT_RIGHT
+        return inputs
+
+    return policy
+
+
+def make_policy(name, seed=None):
+    """Build a bot by name: idle, random or aim"""
+    if name == "idle":
+        return idle_policy
+    if name == "aim":
+        return make_aim_policy()
+    return make_random_policy(seed)
+
+
+BOTS = ["random", "aim", "idle"]
+
+
+def run_headless(max_ticks, policy=idle_policy, state=None):
+    """Step one game until it ends or max_ticks pass; return a result dict"""
+    if state is None:
+        state = game.GameState()
+    step = game.step_simulation
+
+    start = time.perf_counter()
+    while not state.game_over and state.tick < max_ticks:
+        step(state, policy(state))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": state.tick,
+        "score": state.score,
+        "game_over": state.game_over,
+        "seconds": elapsed,
+        "ticks_per_sec": state.tick / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the space game without a display")
+    parser.add_argument("--ticks", type=int, default=100000, help="tick limit per game")
+    parser.add_argument("--games", type=int, default=1, help="number of games to run")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the games and the bot")
+    parser.add_argument("--bot", choices=BOTS, default="random", help="which bot plays")
+    args = parser.parse_args()
+
+    for i in range(args.games):
+        seed = None if args.seed is None else args.seed + i
+        policy = make_policy(args.bot, seed)
+        result = run_headless(args.ticks, policy, game.GameState(seed))
+        print(f"game {i + 1}: {result['ticks']} ticks, score {result['score']}, "
+              f"{result['ticks_per_sec']:.0f} ticks/sec")
+
+
+if __name__ == "__main__":
+    main()
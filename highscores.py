@@ -0,0 +1,126 @@
+# High Score Store
+# Every finished game is kept in a SQLite table (score, seed, ticks,
+# timestamp). Writes go through a queue to a background thread, which
+# commits whatever has piled up in one transaction, so saving a score
+# never blocks a frame and a crash can't leave half a batch behind. The
+# table has an index on score, so loading the top N is one indexed read
+# however many runs have been stored.
+#
+#   store = ScoreStore("highscores.db")
+#   best = store.top(10)          # [(score, seed, ticks, timestamp), ...]
+#   store.submit(score, seed, ticks)
+#   store.close()                 # flushes pending writes
+
+import queue
+import sqlite3
+import threading
+import time
+
+# --- Constants ---
+DEFAULT_PATH = "highscores.db"
+DEFAULT_TOP = 10
+BATCH_SIZE = 256  # most scores committed in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    seed INTEGER,
+    ticks INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, played_at);
+"""
+
+_STOP = object()  # tells the writer thread to finish
+
+
+def connect(path):
+    """Open the database and make sure the table and index exist"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")  # readers don't wait for the writer
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class ScoreStore:
+    """Leaderboard on disk with asynchronous, batched writes"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.written = 0
+        self.errors = 0
+        connect(path).close()  # create the schema before anyone reads
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, name="score-writer", daemon=True)
+        self.thread.start()
+
+    def top(self, n=DEFAULT_TOP):
+        """Best n runs as (score, seed, ticks, timestamp), highest first"""
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(
+                "SELECT score, seed, ticks, played_at FROM scores "
+                "ORDER BY score DESC, played_at LIMIT ?", (n,)).fetchall()
+        finally:
+            conn.close()
+
+    def best(self):
+        """Highest stored score, 0 if there is none"""
+        rows = self.top(1)
+        return rows[0][0] if rows else 0
+
+    def count(self):
+        """Number of runs stored"""
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        finally:
+            conn.close()
+
+    def submit(self, score, seed=None, ticks=None, played_at=None):
+        """Queue a finished run for saving; returns immediately"""
+        if played_at is None:
+            played_at = time.time()
+        self.pending.put((score, seed, ticks, played_at))
+
+    def flush(self):
+        """Block until every submitted score has been committed"""
+        self.pending.join()
+
+    def close(self):
+        """Write what is still queued and stop the writer thread"""
+        if self.thread.is_alive():
+            self.pending.put(_STOP)
+            self.thread.join()
+
+    def _writer(self):
+        """Background thread: commit queued scores in batches"""
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = [self.pending.get()]
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self.pending.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = _STOP in batch
+                rows = [row for row in batch if row is not _STOP]
+                if rows:
+                    try:
+                        with conn:  # one transaction: all rows or none
+                            conn.executemany(
+                                "INSERT INTO scores (score, seed, ticks, played_at) "
+                                "VALUES (?, ?, ?, ?)", rows)
+                        self.written += len(rows)
+                    except sqlite3.Error as e:
+                        self.errors += 1
+                        print(f"Could not save scores: {e}")
+                for _ in batch:
+                    self.pending.task_done()
+                if stop:
+                    break
+        finally:
+            conn.close()
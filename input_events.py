@@ -0,0 +1,72 @@
+# Event-Driven Input
+# Only the event types a game handles are let into the SDL queue
+# (everything else - mouse motion, joystick, text input... - is dropped
+# before it reaches Python), and held keys are tracked as a bitmask
+# updated from KEYDOWN/KEYUP instead of polling the whole keyboard with
+# pygame.key.get_pressed() every frame. Screens that only wait for a key
+# can sleep in wait() until something happens.
+#
+#   allow_events(GAME_EVENTS)
+#   keys = InputState({pygame.K_LEFT: 1, pygame.K_RIGHT: 2})
+#   for event in keys.pump():   # once per frame
+#       ...
+#   keys.held                   # bitmask of bound keys being held
+
+import pygame
+
+# --- Constants ---
+# What the games need: quitting, keys, and losing focus (to release keys)
+GAME_EVENTS = [
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWEXPOSED,
+]
+
+
+def allow_events(event_types):
+    """Block every event type except the given ones (display must be initialized)"""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(event_types))
+    pygame.event.clear()  # drop anything that got in before the filter
+
+
+class InputState:
+    """Held-key bitmask kept up to date from key events"""
+
+    def __init__(self, bindings):
+        self.bindings = dict(bindings)  # key -> bit
+        self.held = 0
+        self.events = 0  # events handled, for profiling
+
+    def handle(self, event):
+        """Update the bitmask from one event"""
+        self.events += 1
+        if event.type == pygame.KEYDOWN:
+            self.held |= self.bindings.get(event.key, 0)
+        elif event.type == pygame.KEYUP:
+            self.held &= ~self.bindings.get(event.key, 0)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.held = 0  # the KEYUPs will go to another window
+
+    def pump(self):
+        """Take every queued event, track the bound keys and return the events"""
+        events = pygame.event.get()
+        for event in events:
+            self.handle(event)
+        return events
+
+    def wait(self, timeout=0):
+        """Sleep until an event arrives or timeout ms pass (0 = no limit).
+
+        Returns the event, or one of type NOEVENT on timeout.
+        """
+        event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.wait()
+        if event.type != pygame.NOEVENT:
+            self.handle(event)
+        return event
+
+    def reset(self):
+        """Forget all held keys"""
+        self.held = 0
@@ -3,6 +3,12 @@ import os
 import random
 import sys
 
+from asset_cache import load_atlas
+from asset_loader import AssetLoader, load_sounds
+from input_events import GAME_EVENTS, InputState, allow_events
+from spatial_hash import SpatialHash, check_bullet_enemy_collision_hashed
+from text_cache import TextCache
+
 # --- Constants ---
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
@@ -16,41 +22,83 @@ BULLET_SPEED = 10
 BULLET_WIDTH = 5
 BULLET_HEIGHT = 15
 FPS = 60
+SPAWN_ENEMY_EVENT = pygame.USEREVENT + 1  # timer event that spawns an enemy
+
+# --- Input Bits ---
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+
+# --- Collision Settings ---
+# "hash" uses the spatial-hash broadphase, "brute" the original nested loop
+COLLISION_MODE = "hash"
 
 # --- Colors ---
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
+GRAY = (128, 128, 128)
 STAR_COLOR = (200, 200, 200)
 
 # --- Game Setup ---
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Asteroid Dodger")
-clock = pygame.time.Clock()
-
-# --- Asset Loading ---
+# The window is created by init_game(), not at import; images and sounds
+# load in the background and plain shapes are drawn until they arrive
+screen = None
+clock = None
+player_img = None
+enemy_img = None
+sounds = {}
+asset_loader = AssetLoader()
 IMG_DIR = "img"
-try:
-    player_img = pygame.image.load(os.path.join(IMG_DIR, "spaceship.png")).convert_alpha()
-    player_img = pygame.transform.scale(player_img, (PLAYER_WIDTH, PLAYER_HEIGHT))
-    enemy_img = pygame.image.load(os.path.join(IMG_DIR, "asteroid.png")).convert_alpha()
-    enemy_img = pygame.transform.scale(enemy_img, (ENEMY_WIDTH, ENEMY_HEIGHT))
-except pygame.error as e:
-    print("Unable to load image (spaceship.png or asteroid.png).")
-    print("Please make sure the images are in the correct folder.")
-    print(e)
-    sys.exit()
+SOUND_DIR = "sound"
 
 # --- Game Objects ---
-player_rect = player_img.get_rect(centerx=SCREEN_WIDTH // 2, bottom=SCREEN_HEIGHT - 10)
+player_rect = pygame.Rect(0, 0, PLAYER_WIDTH, PLAYER_HEIGHT)
+player_rect.centerx = SCREEN_WIDTH // 2
+player_rect.bottom = SCREEN_HEIGHT - 10
 enemies = []
 bullets = []
 score = 0
-font = pygame.font.Font(None, 36)
+text_cache = TextCache()
+collision_grid = SpatialHash()
+input_state = InputState({pygame.K_LEFT: MOVE_LEFT, pygame.K_RIGHT: MOVE_RIGHT})
 stars = [[random.randrange(SCREEN_WIDTH), random.randrange(SCREEN_HEIGHT)] for _ in range(150)]
 
+# --- SETUP FUNCTIONS ---
+
+def init_game():
+    """Starts the display and font subsystems, opens the window and starts loading assets."""
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Asteroid Dodger")
+    clock = pygame.time.Clock()
+    allow_events(GAME_EVENTS + [SPAWN_ENEMY_EVENT])
+
+    # Scaled sprites come from a cached texture atlas (see asset_cache.py)
+    asset_loader.add("images", load_atlas, [
+        ("player", os.path.join(IMG_DIR, "spaceship.png"), (PLAYER_WIDTH, PLAYER_HEIGHT), 0),
+        ("enemy", os.path.join(IMG_DIR, "asteroid.png"), (ENEMY_WIDTH, ENEMY_HEIGHT), 0),
+    ], "main", convert=False, on_ready=use_images)
+    asset_loader.add("sounds", load_sounds, [
+        ("shoot", os.path.join(SOUND_DIR, "shoot.wav")),
+        ("explosion", os.path.join(SOUND_DIR, "explosion.wav")),
+    ], on_ready=sounds.update)
+    asset_loader.start()
+
+def use_images(atlas):
+    """Called when the images have loaded: draw sprites from now on."""
+    global player_img, enemy_img
+    atlas.convert()
+    player_img = atlas.get("player")
+    enemy_img = atlas.get("enemy")
+
+def play_sound(name):
+    """Plays a sound effect if it has loaded."""
+    if name in sounds:
+        sounds[name].play()
+
 # --- LOGIC FUNCTIONS ---
 
 def update_stars():
@@ -75,13 +123,19 @@ def move_objects():
 def handle_collisions():
     """Checks for collisions and returns True if the game is over."""
     global score
-    for bullet in bullets[:]:
-        for enemy in enemies[:]:
-            if bullet.colliderect(enemy):
-                enemies.remove(enemy)
-                bullets.remove(bullet)
-                score += 1
-                break
+    score_before = score
+    if COLLISION_MODE == "hash":
+        score += check_bullet_enemy_collision_hashed(bullets, enemies, collision_grid)
+    else:
+        for bullet in bullets[:]:
+            for enemy in enemies[:]:
+                if bullet.colliderect(enemy):
+                    enemies.remove(enemy)
+                    bullets.remove(bullet)
+                    score += 1
+                    break
+    if score > score_before:
+        play_sound("explosion")
     for enemy in enemies:
         if player_rect.colliderect(enemy):
             return True  # Game Over
@@ -96,15 +150,21 @@ def draw_screen():
     for star in stars:
         pygame.draw.circle(screen, STAR_COLOR, star, 1)
     
-    # Draw player, enemies, and bullets
-    screen.blit(player_img, player_rect)
+    # Draw player, enemies, and bullets (shapes until the images have loaded)
+    if player_img:
+        screen.blit(player_img, player_rect)
+    else:
+        pygame.draw.rect(screen, WHITE, player_rect)
     for enemy in enemies:
-        screen.blit(enemy_img, enemy)
+        if enemy_img:
+            screen.blit(enemy_img, enemy)
+        else:
+            pygame.draw.rect(screen, GRAY, enemy)
     for bullet in bullets:
         pygame.draw.rect(screen, YELLOW, bullet)
         
     # Draw score
-    score_text = font.render(f"Score: {score}", True, WHITE)
+    score_text = text_cache.render(f"Score: {score}", 36, WHITE)
     screen.blit(score_text, (10, 10))
     
     # Update the display
@@ -112,25 +172,25 @@ def draw_screen():
 
 def show_game_over_screen():
     """Displays the game over message and waits for player input."""
-    # This function is fine as is, no changes needed.
     screen.fill(BLACK)
-    title_font = pygame.font.Font(None, 74)
-    sub_font = pygame.font.Font(None, 48)
-    title_text = title_font.render("GAME OVER", True, RED)
-    score_text = sub_font.render(f"Final Score: {score}", True, WHITE)
-    restart_text = sub_font.render("Press 'R' to Restart or 'Q' to Quit", True, WHITE)
+    title_text = text_cache.render_static("GAME OVER", 74, RED)
+    score_text = text_cache.render(f"Final Score: {score}", 48, WHITE)
+    restart_text = text_cache.render_static("Press 'R' to Restart or 'Q' to Quit", 48, WHITE)
     screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
     screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
     screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 100))
     pygame.display.flip()
     waiting = True
     while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                waiting = False
+        # Nothing moves on this screen, so sleep until an event arrives
+        event = input_state.wait()
+        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+            waiting = False
+        if event.type == pygame.WINDOWEXPOSED:
+            pygame.display.flip()
 
 # --- Main Game Loop ---
 def game_loop():
@@ -143,13 +203,14 @@ def game_loop():
     player_rect.bottom = SCREEN_HEIGHT - 10
     
     # Use a custom timer event for spawning enemies for better consistency
-    SPAWN_ENEMY_EVENT = pygame.USEREVENT + 1
     pygame.time.set_timer(SPAWN_ENEMY_EVENT, 600) # Spawn an enemy every 600ms
 
     running = True
     while running:
+        asset_loader.poll()
+
         # --- Event Handling ---
-        for event in pygame.event.get():
+        for event in input_state.pump():
             if event.type == pygame.QUIT:
                 running = False
                 # Use break to exit the loop cleanly, pygame.quit() is handled outside
@@ -158,6 +219,7 @@ def game_loop():
                 if event.key == pygame.K_SPACE:
                     bullet_rect = pygame.Rect(player_rect.centerx - (BULLET_WIDTH // 2), player_rect.top, BULLET_WIDTH, BULLET_HEIGHT)
                     bullets.append(bullet_rect)
+                    play_sound("shoot")
             if event.type == SPAWN_ENEMY_EVENT:
                 enemy_rect = pygame.Rect(random.randint(0, SCREEN_WIDTH - ENEMY_WIDTH), -ENEMY_HEIGHT, ENEMY_WIDTH, ENEMY_HEIGHT)
                 enemies.append(enemy_rect)
@@ -165,10 +227,10 @@ def game_loop():
         if not running: continue
 
         # --- 1. UPDATE GAME STATE ---
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and player_rect.left > 0:
+        held = input_state.held
+        if held & MOVE_LEFT and player_rect.left > 0:
             player_rect.x -= PLAYER_SPEED
-        if keys[pygame.K_RIGHT] and player_rect.right < SCREEN_WIDTH:
+        if held & MOVE_RIGHT and player_rect.right < SCREEN_WIDTH:
             player_rect.x += PLAYER_SPEED
         
         update_stars()
@@ -183,6 +245,8 @@ def game_loop():
         clock.tick(FPS)
 
 # --- Game Start ---
-while True:
-    game_loop()
-    show_game_over_screen()
\ No newline at end of file
+if __name__ == "__main__":
+    init_game()
+    while True:
+        game_loop()
+        show_game_over_screen()
\ No newline at end of file
@@ -5,6 +5,8 @@ import pygame
 import sys
 import random
 
+from text_cache import TextCache
+
 # --- Constants ---
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
@@ -43,6 +45,14 @@ enemies = []
 bullets = []
 score = 0
 
+text_cache = TextCache()
+
+INSTRUCTIONS = [
+    "LEFT/RIGHT arrows - Move",
+    "SPACEBAR - Shoot",
+    "Destroy asteroids for points!"
+]
+
 # --- Visual Effects ---
 # Create animated star field background
 stars = []
@@ -132,12 +142,9 @@ def draw_everything():
                                bullet.width + 2, bullet.height + 2)
         pygame.draw.rect(screen, WHITE, glow_rect, 1)
     
-    # Draw enhanced UI
-    font = pygame.font.Font(None, 48)
-    small_font = pygame.font.Font(None, 28)
-    
+    # Draw enhanced UI (fonts and text surfaces come from the text cache)
     # Score with background
-    score_text = font.render(f"Score: {score}", True, WHITE)
+    score_text = text_cache.render(f"Score: {score}", 48, WHITE)
     score_bg = pygame.Rect(10, 10, score_text.get_width() + 20, score_text.get_height() + 10)
     pygame.draw.rect(screen, (0, 0, 0, 128), score_bg)  # Semi-transparent background
     pygame.draw.rect(screen, WHITE, score_bg, 2)
@@ -145,20 +152,13 @@ def draw_everything():
     
     # Game stats
     stats_y = 80
-    enemies_text = small_font.render(f"Asteroids: {len(enemies)}", True, GREEN)
-    bullets_text = small_font.render(f"Bullets: {len(bullets)}", True, YELLOW)
+    enemies_text = text_cache.render(f"Asteroids: {len(enemies)}", 28, GREEN)
+    bullets_text = text_cache.render(f"Bullets: {len(bullets)}", 28, YELLOW)
     screen.blit(enemies_text, (10, stats_y))
     screen.blit(bullets_text, (10, stats_y + 25))
     
     # Instructions with better formatting
-    instructions = [
-        "LEFT/RIGHT arrows - Move",
-        "SPACEBAR - Shoot",
-        "Destroy asteroids for points!"
-    ]
-    
-    for i, instruction in enumerate(instructions):
-        text = small_font.render(instruction, True, WHITE)
+    for i, text in enumerate(text_cache.prebake(INSTRUCTIONS, 28, WHITE)):
         screen.blit(text, (SCREEN_WIDTH - text.get_width() - 10, 10 + i * 25))
     
     # Update display
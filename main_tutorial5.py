@@ -5,6 +5,32 @@ import pygame
 import sys
 import random
 import os
+import argparse
+import time
+import sqlite3
+
+from asset_cache import load_atlas
+from asset_loader import AssetLoader, load_sounds
+from dirty_rect import DirtyRectRenderer
+from highscores import ScoreStore
+from input_events import GAME_EVENTS, InputState, allow_events
+from profiler import FrameProfiler
+from quality_governor import QualityGovernor
+from rect_pool import RectPool
+from replay import MAX_SEED, InputRecorder, ReplayError, load_replay
+from spatial_hash import SpatialHash, check_bullet_enemy_collision_hashed, remove_indices
+from sprite_batch import SpriteBatch, make_box_sprite, make_glow_sprite
+from starfield import Starfield
+from sweep_prune import SweepAndPrune, check_bullet_enemy_collision_sap
+from text_cache import TextCache
+
+try:
+    from entity_store import EntityStore
+    from starfield_np import VectorStarfield
+except ImportError:
+    # NumPy not installed, only the pure-Python backends are available
+    EntityStore = None
+    VectorStarfield = None
 
 # --- Constants ---
 SCREEN_WIDTH = 1280
@@ -18,7 +44,57 @@ BULLET_HEIGHT = 15
 PLAYER_SPEED = 7
 ENEMY_SPEED = 3
 BULLET_SPEED = 10
-FPS = 60
+FPS = 60  # render rate cap (any value works, the simulation has its own rate)
+GAME_OVER_FPS = 15  # star animation rate on the game over screen (0 = still)
+
+# --- Timing ---
+# The simulation always advances in fixed ticks of 1 / SIM_RATE seconds;
+# the speeds above are in pixels per tick. Rendering interpolates between
+# the last two ticks, so the game runs at the same speed at any frame rate.
+SIM_RATE = 60
+TICK_SECONDS = 1 / SIM_RATE
+MAX_FRAME_SECONDS = 0.25  # longer frames are clamped so the game can catch up
+
+# --- Difficulty Curve ---
+# Ticks between enemy spawns: max(SPAWN_RATE_MIN, SPAWN_RATE_START - score // SPAWN_RATE_DIVISOR)
+SPAWN_RATE_START = 60
+SPAWN_RATE_MIN = 20
+SPAWN_RATE_DIVISOR = 3
+
+# --- Collision Settings ---
+# "hash" uses the spatial-hash broadphase, "sap" sweep and prune along x,
+# "brute" the original nested loop
+COLLISION_MODE = "hash"
+# In "sap" mode, test bullets along the whole path they travelled this
+# step so fast bullets can't skip over an enemy between two frames
+SWEPT_COLLISIONS = True
+
+# --- Entity Settings ---
+# "pool" recycles Rects through RectPool, "list" keeps plain lists of Rects,
+# "numpy" uses EntityStore
+ENTITY_BACKEND = "pool"
+ENEMY_POOL_SIZE = 256
+BULLET_POOL_SIZE = 256
+
+# --- Render Settings ---
+# Dirty-rect mode (--dirty-rects) falls back to a full flip when more than
+# this fraction of the screen changed in a frame
+DIRTY_RECT_THRESHOLD = 0.5
+
+# --- Adaptive Quality ---
+# With --adaptive-quality these features are given up in this order while
+# the average frame work time is above QUALITY_DEGRADE_MS, and brought back
+# once it drops below QUALITY_RESTORE_MS
+QUALITY_LADDER = ["all_stars", "bullet_glow", "hud_stats", "enemy_images"]
+QUALITY_DEGRADE_MS = 12.0
+QUALITY_RESTORE_MS = 7.0
+REDUCED_STAR_DETAIL = 0.34  # fraction of the star layers kept without "all_stars"
+
+# --- Input Bits ---
+# One tick of player input packed into an int (see step_simulation)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -30,52 +106,168 @@ YELLOW = (255, 255, 0)
 STAR_COLOR = (200, 200, 200)
 GREEN = (0, 255, 0)
 
-# --- Initialize Pygame ---
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Space Game Tutorial 5 - Complete Game")
-clock = pygame.time.Clock()
+# --- Star Layers ---
+# (speed in pixels per tick, number of stars, color, radius), back to front
+STAR_LAYERS = [
+    (0.5, 100, (110, 110, 110), 1),
+    (1, 150, STAR_COLOR, 1),
+    (2, 30, WHITE, 2),
+]
+
+# "layers" scrolls pre-rendered layers, "numpy" moves individual stars with
+# NumPy (use it with very large star counts, e.g. STAR_DENSITY = 300)
+STARFIELD_BACKEND = "layers"
+STAR_DENSITY = 1  # multiplies the star count of every layer
+
+# --- Pygame Objects ---
+# Created by init_game() rather than at import, so tools can import this
+# module (and run step_simulation) without opening a window
+screen = None
+clock = None
+startup_times = {}  # init_game phase -> milliseconds
 
-# --- Try to Load Images (Optional Enhancement) ---
+# --- Images and Sounds (Optional Enhancement) ---
+# Scaled sprites come from a cached texture atlas.
+# Both are loaded in the background; rectangles and silence until they arrive
 IMG_DIR = "img"
+SOUND_DIR = "sound"
+SOUND_FILES = [
+    ("shoot", "shoot.wav"),
+    ("explosion", "explosion.wav"),
+    ("game_over", "game_over.wav"),
+]
 player_img = None
 enemy_img = None
+sounds = {}
+asset_loader = None  # AssetLoader started by init_game()
 
-try:
-    if os.path.exists(os.path.join(IMG_DIR, "spaceship.png")):
-        player_img = pygame.image.load(os.path.join(IMG_DIR, "spaceship.png")).convert_alpha()
-        player_img = pygame.transform.scale(player_img, (PLAYER_WIDTH, PLAYER_HEIGHT))
+# --- Game Variables ---
+high_score = 0  # loaded from the score store at startup
+SCORES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "highscores.db")
+text_cache = TextCache()
+sprite_batch = SpriteBatch()
+enemy_box_sprite = None  # rectangle look of an enemy, baked on first draw
+bullet_sprite = None  # bullet plus glow outline, baked on first draw
+plain_bullet_sprite = None  # bullet without glow, for reduced quality
+renderer = None  # DirtyRectRenderer when started with --dirty-rects
+profiler = None  # FrameProfiler when started with --profile (F3 toggles the overlay)
+profile_path = None  # per-frame timings are written here with --profile-out
+governor = None  # QualityGovernor when started with --adaptive-quality
+score_store = None  # ScoreStore that keeps every finished run (off with --no-scores)
+input_state = InputState({pygame.K_LEFT: INPUT_LEFT, pygame.K_RIGHT: INPUT_RIGHT})
+
+INSTRUCTIONS = [
+    "LEFT/RIGHT - Move",
+    "SPACEBAR - Shoot",
+    "Survive as long as possible!"
+]
+
+# --- Startup ---
+def use_sprites(atlas):
+    """Loader callback: switch from rectangles to the loaded sprites"""
+    global player_img, enemy_img
+    atlas.convert()
+    player_img = atlas.get("player")
+    enemy_img = atlas.get("enemy")
+    if renderer:
+        renderer.invalidate()
+
+def use_sounds(loaded):
+    """Loader callback: enable the sound effects"""
+    sounds.update(loaded)
+
+def play_sound(name):
+    """Play a sound effect if it has been loaded"""
+    sound = sounds.get(name)
+    if sound:
+        sound.play()
+
+def start_asset_loader():
+    """Start loading the optional sprites and sounds in the background"""
+    global asset_loader
+    asset_loader = AssetLoader()
     
+    sprite_specs = []
+    if os.path.exists(os.path.join(IMG_DIR, "spaceship.png")):
+        sprite_specs.append(("player", os.path.join(IMG_DIR, "spaceship.png"),
+                             (PLAYER_WIDTH, PLAYER_HEIGHT), 0))
     if os.path.exists(os.path.join(IMG_DIR, "asteroid.png")):
-        enemy_img = pygame.image.load(os.path.join(IMG_DIR, "asteroid.png")).convert_alpha()
-        enemy_img = pygame.transform.scale(enemy_img, (ENEMY_WIDTH, ENEMY_HEIGHT))
-except pygame.error:
-    print("Images not found, using colored rectangles instead")
+        sprite_specs.append(("enemy", os.path.join(IMG_DIR, "asteroid.png"),
+                             (ENEMY_WIDTH, ENEMY_HEIGHT), 0))
+    
+    if sprite_specs:
+        asset_loader.add("sprites", load_atlas, sprite_specs, "tutorial5",
+                         convert=False, on_ready=use_sprites)
+    else:
+        print("Images not found, using colored rectangles instead")
+    
+    sound_specs = [(name, os.path.join(SOUND_DIR, filename))
+                   for name, filename in SOUND_FILES
+                   if os.path.exists(os.path.join(SOUND_DIR, filename))]
+    if sound_specs:
+        asset_loader.add("sounds", load_sounds, sound_specs, on_ready=use_sounds)
+    asset_loader.start()
 
-# --- Game Variables ---
-high_score = 0
+def init_game():
+    """Start the display and font subsystems, open the window and start loading assets.
+    
+    Only the subsystems the game uses are initialized (no joystick; audio
+    is opened by the asset loader if there are sounds). Images and sounds
+    arrive later through asset_loader.poll(). Each step's time is recorded
+    in startup_times.
+    """
+    global screen, clock
+    if screen is not None:
+        return screen
+    
+    last = time.perf_counter()
+    def mark(phase):
+        nonlocal last
+        now = time.perf_counter()
+        startup_times[phase] = (now - last) * 1000
+        last = now
+    
+    pygame.display.init()
+    pygame.font.init()
+    mark("subsystems")
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Space Game Tutorial 5 - Complete Game")
+    clock = pygame.time.Clock()
+    allow_events(GAME_EVENTS)
+    mark("display")
+    start_asset_loader()
+    mark("loader")
+    text_cache.prebake(INSTRUCTIONS, 28, WHITE)
+    mark("text")
+    return screen
 
 # --- Game Functions ---
+def create_entity_container(capacity):
+    """Return an empty enemy/bullet container for ENTITY_BACKEND"""
+    if ENTITY_BACKEND == "pool":
+        return RectPool(capacity)
+    if ENTITY_BACKEND == "numpy" and EntityStore is not None:
+        return EntityStore(capacity)
+    return []
+
 def create_stars():
-    """Create the star field background"""
-    stars = []
-    for _ in range(150):
-        x = random.randint(0, SCREEN_WIDTH)
-        y = random.randint(0, SCREEN_HEIGHT)
-        stars.append([x, y])
-    return stars
-
-def update_stars(stars):
-    """Move stars down to create scrolling space effect"""
-    for star in stars:
-        star[1] += 1
-        if star[1] > SCREEN_HEIGHT:
-            star[1] = 0
-            star[0] = random.randint(0, SCREEN_WIDTH)
-
-def spawn_enemy(enemies):
+    """Create the parallax star field background for STARFIELD_BACKEND"""
+    layers = [(speed, count * STAR_DENSITY, color, radius)
+              for speed, count, color, radius in STAR_LAYERS]
+    if STARFIELD_BACKEND == "numpy" and VectorStarfield is not None:
+        return VectorStarfield(SCREEN_WIDTH, SCREEN_HEIGHT, layers)
+    return Starfield(SCREEN_WIDTH, SCREEN_HEIGHT, layers)
+
+def update_stars(stars, frames=1):
+    """Scroll the star layers down to create the moving space effect"""
+    stars.update(frames)
+
+def spawn_enemy(enemies, rng=random):
     """Create a new enemy at the top of the screen"""
-    x = random.randint(0, SCREEN_WIDTH - ENEMY_WIDTH)
+    x = rng.randint(0, SCREEN_WIDTH - ENEMY_WIDTH)
+    if not isinstance(enemies, list):
+        enemies.spawn(x, -ENEMY_HEIGHT, ENEMY_WIDTH, ENEMY_HEIGHT)
+        return
     enemy_rect = pygame.Rect(x, -ENEMY_HEIGHT, ENEMY_WIDTH, ENEMY_HEIGHT)
     enemies.append(enemy_rect)
 
@@ -83,11 +275,17 @@ def shoot_bullet(player_rect, bullets):
     """Create a new bullet from player position"""
     bullet_x = player_rect.centerx - BULLET_WIDTH // 2
     bullet_y = player_rect.top
+    if not isinstance(bullets, list):
+        bullets.spawn(bullet_x, bullet_y, BULLET_WIDTH, BULLET_HEIGHT)
+        return
     bullet_rect = pygame.Rect(bullet_x, bullet_y, BULLET_WIDTH, BULLET_HEIGHT)
     bullets.append(bullet_rect)
 
 def update_enemies(enemies):
     """Move enemies down and remove them when they go off-screen"""
+    if not isinstance(enemies, list):
+        enemies.scroll(ENEMY_SPEED, bottom_limit=SCREEN_HEIGHT)
+        return
     for enemy in enemies[:]:
         enemy.y += ENEMY_SPEED
         if enemy.top > SCREEN_HEIGHT:
@@ -95,13 +293,42 @@ def update_enemies(enemies):
 
 def update_bullets(bullets):
     """Move bullets up and remove them when they go off-screen"""
+    if not isinstance(bullets, list):
+        bullets.scroll(-BULLET_SPEED, top_limit=0)
+        return
     for bullet in bullets[:]:
         bullet.y -= BULLET_SPEED
         if bullet.bottom < 0:
             bullets.remove(bullet)
 
+collision_grid = SpatialHash()
+collision_sweep = SweepAndPrune()
+
 def check_bullet_enemy_collision(bullets, enemies):
     """Check if any bullet hits any enemy and return score increase"""
+    if COLLISION_MODE == "sap":
+        sweep = BULLET_SPEED + ENEMY_SPEED if SWEPT_COLLISIONS else 0
+        return check_bullet_enemy_collision_sap(bullets, enemies, collision_sweep, sweep)
+    if COLLISION_MODE == "hash":
+        return check_bullet_enemy_collision_hashed(bullets, enemies, collision_grid)
+    return check_bullet_enemy_collision_brute(bullets, enemies)
+
+def check_bullet_enemy_collision_brute(bullets, enemies):
+    """Reference O(bullets x enemies) collision check"""
+    if not isinstance(enemies, list):
+        # Pool/store: same pairing, removed by index once the loop is done
+        enemy_list = list(enemies)
+        dead_bullets = set()
+        dead_enemies = set()
+        for b, bullet in enumerate(bullets):
+            for e, enemy in enumerate(enemy_list):
+                if e not in dead_enemies and bullet.colliderect(enemy):
+                    dead_bullets.add(b)
+                    dead_enemies.add(e)
+                    break
+        remove_indices(bullets, dead_bullets)
+        remove_indices(enemies, dead_enemies)
+        return len(dead_enemies)
     score_increase = 0
     for bullet in bullets[:]:
         for enemy in enemies[:]:
@@ -114,19 +341,118 @@ def check_bullet_enemy_collision(bullets, enemies):
 
 def check_player_enemy_collision(player_rect, enemies):
     """Check if player collides with any enemy"""
+    if not isinstance(enemies, list):
+        return enemies.any_collide(player_rect)
     for enemy in enemies:
         if player_rect.colliderect(enemy):
             return True
     return False
 
-def draw_game(screen, player_rect, enemies, bullets, stars, score, high_score):
-    """Draw all game objects"""
+# --- Simulation ---
+def simulation_config():
+    """The settings besides seed and inputs that change how a game plays out"""
+    return {
+        "COLLISION_MODE": COLLISION_MODE,
+        "SWEPT_COLLISIONS": SWEPT_COLLISIONS,
+        "ENTITY_BACKEND": ENTITY_BACKEND,
+    }
+
+class GameState:
+    """Everything the simulation needs, kept apart from rendering"""
+    
+    def __init__(self, seed=None):
+        # All randomness comes from this seeded RNG so a game can be replayed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.player_rect = pygame.Rect(SCREEN_WIDTH // 2 - PLAYER_WIDTH // 2, 
+                                       SCREEN_HEIGHT - PLAYER_HEIGHT - 10, 
+                                       PLAYER_WIDTH, PLAYER_HEIGHT)
+        # Float player position (player_rect is its integer copy) and the
+        # previous tick's value for render interpolation
+        self.player_x = float(self.player_rect.x)
+        self.prev_player_x = self.player_x
+        self.enemies = create_entity_container(ENEMY_POOL_SIZE)
+        self.bullets = create_entity_container(BULLET_POOL_SIZE)
+        self.score = 0
+        self.enemy_spawn_timer = 0
+        self.tick = 0
+        self.game_over = False
+
+def step_simulation(state, inputs, profiler=None):
+    """Advance the game by one tick using an INPUT_* bitmask.
+    
+    Does no drawing, event handling or timing, so it runs the same under
+    the SDL dummy video driver as in a window. The state is updated in
+    place and returned. If a FrameProfiler is given each phase is timed.
+    """
+    player_rect = state.player_rect
+    
+    # Shooting
+    if inputs & INPUT_FIRE:
+        shoot_bullet(player_rect, state.bullets)
+    
+    # Player movement
+    state.prev_player_x = state.player_x
+    if inputs & INPUT_LEFT and state.player_x > 0:
+        state.player_x -= PLAYER_SPEED
+    if inputs & INPUT_RIGHT and state.player_x + PLAYER_WIDTH < SCREEN_WIDTH:
+        state.player_x += PLAYER_SPEED
+    player_rect.x = int(state.player_x)
+    if profiler:
+        profiler.mark("player")
+    
+    # Spawn enemies with increasing difficulty
+    state.enemy_spawn_timer += 1
+    spawn_rate = max(SPAWN_RATE_MIN, SPAWN_RATE_START - state.score // SPAWN_RATE_DIVISOR)  # Gets faster as score increases
+    if state.enemy_spawn_timer >= spawn_rate:
+        spawn_enemy(state.enemies, state.rng)
+        state.enemy_spawn_timer = 0
+    
+    if profiler:
+        profiler.mark("spawn")
+    
+    # Update game objects
+    update_enemies(state.enemies)
+    if profiler:
+        profiler.mark("enemies")
+    update_bullets(state.bullets)
+    if profiler:
+        profiler.mark("bullets")
+    
+    # Check collisions
+    state.score += check_bullet_enemy_collision(state.bullets, state.enemies)
+    if check_player_enemy_collision(player_rect, state.enemies):
+        state.game_over = True
+    if profiler:
+        profiler.mark("collision")
+    
+    state.tick += 1
+    return state
+
+# --- Drawing ---
+def draw_game(screen, player_rect, enemies, bullets, stars, score, high_score,
+              renderer=None, profiler=None, alpha=1.0, quality=None):
+    """Draw all game objects (only damaged regions are pushed if renderer is given).
+    
+    alpha (0-1) is how far rendering is between the previous and the latest
+    simulation tick; enemies and bullets are drawn that far back along
+    their path. The caller interpolates player_rect itself. If a
+    QualityGovernor is given, features it has switched off are skipped.
+    """
+    def enabled(feature):
+        return quality is None or quality.enabled(feature)
+    
+    back = 1.0 - alpha
+    enemy_shift = -round(back * ENEMY_SPEED)
+    bullet_shift = round(back * BULLET_SPEED)
+    
     # Clear screen
     screen.fill(BLACK)
     
     # Draw star field
-    for star in stars:
-        pygame.draw.circle(screen, STAR_COLOR, star, 1)
+    stars.draw(screen, 1.0 if enabled("all_stars") else REDUCED_STAR_DETAIL)
     
     # Draw player (image or rectangle)
     if player_img:
@@ -135,28 +461,27 @@ def draw_game(screen, player_rect, enemies, bullets, stars, score, high_score):
         pygame.draw.rect(screen, BLUE, player_rect)
         pygame.draw.rect(screen, WHITE, player_rect, 2)
     
-    # Draw enemies (images or rectangles)
-    for enemy in enemies:
-        if enemy_img:
-            screen.blit(enemy_img, enemy)
-        else:
-            pygame.draw.rect(screen, GRAY, enemy)
-            pygame.draw.rect(screen, RED, enemy, 2)
-    
-    # Draw bullets with glow effect
-    for bullet in bullets:
-        pygame.draw.rect(screen, YELLOW, bullet)
-        glow_rect = pygame.Rect(bullet.x - 1, bullet.y - 1, 
-                               bullet.width + 2, bullet.height + 2)
-        pygame.draw.rect(screen, WHITE, glow_rect, 1)
-    
-    # Draw UI
-    font = pygame.font.Font(None, 48)
-    small_font = pygame.font.Font(None, 28)
+    # Draw enemies (images or rectangles) and bullets with glow effect,
+    # all submitted in one batched blits() call
+    global enemy_box_sprite, bullet_sprite, plain_bullet_sprite
+    if bullet_sprite is None:
+        enemy_box_sprite = make_box_sprite(ENEMY_WIDTH, ENEMY_HEIGHT, GRAY, RED, 2)
+        bullet_sprite = make_glow_sprite(BULLET_WIDTH, BULLET_HEIGHT, YELLOW, WHITE)
+        plain_bullet_sprite = make_box_sprite(BULLET_WIDTH, BULLET_HEIGHT, YELLOW, YELLOW)
+    if enemy_img and enabled("enemy_images"):
+        sprite_batch.add_rects(enemy_img, enemies, (0, enemy_shift))
+    else:
+        sprite_batch.add_rects(enemy_box_sprite, enemies, (0, enemy_shift))
+    if enabled("bullet_glow"):
+        sprite_batch.add_rects(bullet_sprite, bullets, (-1, bullet_shift - 1))
+    else:
+        sprite_batch.add_rects(plain_bullet_sprite, bullets, (0, bullet_shift))
+    sprite_batch.draw(screen)
     
+    # Draw UI (fonts and text surfaces come from the text cache)
     # Score display
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    high_score_text = small_font.render(f"High Score: {high_score}", True, YELLOW)
+    score_text = text_cache.render(f"Score: {score}", 48, WHITE)
+    high_score_text = text_cache.render(f"High Score: {high_score}", 28, YELLOW)
     
     score_bg = pygame.Rect(10, 10, max(score_text.get_width(), high_score_text.get_width()) + 20, 80)
     pygame.draw.rect(screen, (0, 0, 0, 128), score_bg)
@@ -167,158 +492,321 @@ def draw_game(screen, player_rect, enemies, bullets, stars, score, high_score):
     
     # Game stats
     stats_y = 110
-    enemies_text = small_font.render(f"Asteroids: {len(enemies)}", True, GREEN)
-    bullets_text = small_font.render(f"Bullets: {len(bullets)}", True, YELLOW)
-    screen.blit(enemies_text, (10, stats_y))
-    screen.blit(bullets_text, (10, stats_y + 25))
+    show_stats = enabled("hud_stats")
+    if show_stats:
+        enemies_text = text_cache.render(f"Asteroids: {len(enemies)}", 28, GREEN)
+        bullets_text = text_cache.render(f"Bullets: {len(bullets)}", 28, YELLOW)
+        screen.blit(enemies_text, (10, stats_y))
+        screen.blit(bullets_text, (10, stats_y + 25))
     
     # Instructions
-    instructions = [
-        "LEFT/RIGHT - Move",
-        "SPACEBAR - Shoot",
-        "Survive as long as possible!"
-    ]
-    
-    for i, instruction in enumerate(instructions):
-        text = small_font.render(instruction, True, WHITE)
+    for i, text in enumerate(text_cache.prebake(INSTRUCTIONS, 28, WHITE)):
         screen.blit(text, (SCREEN_WIDTH - text.get_width() - 10, 10 + i * 25))
     
-    pygame.display.flip()
+    # Profiler overlay
+    overlay_rect = None
+    if profiler and profiler.visible:
+        overlay_rect = profiler.draw_overlay(screen, text_cache)
+    if profiler:
+        profiler.mark("draw")
+    
+    # Update the display
+    if renderer:
+        if overlay_rect:
+            renderer.mark(overlay_rect)
+        renderer.mark(player_rect)
+        for enemy in enemies:
+            renderer.mark(enemy.move(0, enemy_shift))
+        for bullet in bullets:
+            renderer.mark(bullet.move(0, bullet_shift).inflate(2, 2))  # include the glow outline
+        renderer.mark(score_bg)
+        if show_stats:
+            renderer.mark(enemies_text.get_rect(topleft=(10, stats_y)))
+            renderer.mark(bullets_text.get_rect(topleft=(10, stats_y + 25)))
+        renderer.present()
+    else:
+        pygame.display.flip()
+    if profiler:
+        profiler.mark("flip")
+
+def quit_game():
+    """Save what is still pending and exit"""
+    if score_store:
+        score_store.close()
+    if profile_path:
+        profiler.export(profile_path)
+    pygame.quit()
+    sys.exit()
+
+def build_game_over_overlay(score, high_score):
+    """Compose all game over text once into one transparent surface"""
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    
+    def center(text, y):
+        overlay.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
+    
+    # High score message
+    if score > high_score:
+        center(text_cache.render_static("NEW HIGH SCORE!", 60, YELLOW), SCREEN_HEIGHT // 2 - 150)
+    else:
+        center(text_cache.render(f"High Score: {high_score}", 60, YELLOW), SCREEN_HEIGHT // 2 - 150)
+    
+    # Main text
+    center(text_cache.render_static("GAME OVER", 100, RED), SCREEN_HEIGHT // 2 - 80)
+    center(text_cache.render(f"Final Score: {score}", 60, WHITE), SCREEN_HEIGHT // 2)
+    
+    # Instructions
+    center(text_cache.render_static("Press 'R' to Restart", 40, GREEN), SCREEN_HEIGHT // 2 + 80)
+    center(text_cache.render_static("Press 'Q' or ESC to Quit", 40, WHITE), SCREEN_HEIGHT // 2 + 120)
+    return overlay
 
 def show_game_over_screen(screen, stars, score, high_score):
-    """Display game over screen with restart option"""
-    waiting = True
+    """Display game over screen with restart option.
     
-    while waiting:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r:
-                    return True  # Restart game
-                elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-        
-        # Draw game over screen
-        screen.fill(BLACK)
-        
-        # Animate stars in background
-        update_stars(stars)
-        for star in stars:
-            pygame.draw.circle(screen, STAR_COLOR, star, 1)
-        
-        # Game over text
-        title_font = pygame.font.Font(None, 100)
-        subtitle_font = pygame.font.Font(None, 60)
-        instruction_font = pygame.font.Font(None, 40)
-        
-        game_over_text = title_font.render("GAME OVER", True, RED)
-        final_score_text = subtitle_font.render(f"Final Score: {score}", True, WHITE)
-        
-        # High score message
-        if score > high_score:
-            high_score_msg = subtitle_font.render("NEW HIGH SCORE!", True, YELLOW)
-            screen.blit(high_score_msg, (SCREEN_WIDTH // 2 - high_score_msg.get_width() // 2, 
-                                        SCREEN_HEIGHT // 2 - 150))
-        else:
-            high_score_text = subtitle_font.render(f"High Score: {high_score}", True, YELLOW)
-            screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 
-                                         SCREEN_HEIGHT // 2 - 150))
-        
-        # Main text
-        screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 
-                                    SCREEN_HEIGHT // 2 - 80))
-        screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, 
-                                      SCREEN_HEIGHT // 2))
+    The text is composed once; only the stars move, at GAME_OVER_FPS, and
+    between those frames the game sleeps in event.wait. With
+    GAME_OVER_FPS = 0 nothing is redrawn unless the window is exposed.
+    """
+    overlay = build_game_over_overlay(score, high_score)
+    frame_ms = 1000 // GAME_OVER_FPS if GAME_OVER_FPS > 0 else 0
+    last_update = pygame.time.get_ticks()
+    next_frame = last_update + frame_ms
+    redraw = True
+    
+    while True:
+        asset_loader.poll()
         
-        # Instructions
-        restart_text = instruction_font.render("Press 'R' to Restart", True, GREEN)
-        quit_text = instruction_font.render("Press 'Q' or ESC to Quit", True, WHITE)
+        if redraw:
+            screen.fill(BLACK)
+            stars.draw(screen)
+            screen.blit(overlay, (0, 0))
+            pygame.display.flip()
+            redraw = False
         
-        screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, 
-                                  SCREEN_HEIGHT // 2 + 80))
-        screen.blit(quit_text, (SCREEN_WIDTH // 2 - quit_text.get_width() // 2, 
-                               SCREEN_HEIGHT // 2 + 120))
+        # Sleep until a key is pressed or the next star frame is due
+        timeout = max(1, next_frame - pygame.time.get_ticks()) if frame_ms else 0
+        event = input_state.wait(timeout)
+        if event.type == pygame.QUIT:
+            quit_game()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r:
+                return True  # Restart game
+            elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
+                quit_game()
+        elif event.type == pygame.WINDOWEXPOSED:
+            redraw = True
         
-        pygame.display.flip()
-        clock.tick(FPS)
-    
-    return False
+        # Animate stars in background (by elapsed time, so they keep their
+        # in-game speed at the lower frame rate)
+        now = pygame.time.get_ticks()
+        if frame_ms and now >= next_frame:
+            update_stars(stars, (now - last_update) * SIM_RATE / 1000)
+            last_update = now
+            next_frame = now + frame_ms
+            redraw = True
 
-def game_loop():
-    """Main game loop"""
+def game_loop(seed=None, recorder=None, playback=None):
+    """Main game loop (optionally recording inputs or playing back a Replay)"""
     global high_score
     
     # Initialize game objects
-    player_rect = pygame.Rect(SCREEN_WIDTH // 2 - PLAYER_WIDTH // 2, 
-                             SCREEN_HEIGHT - PLAYER_HEIGHT - 10, 
-                             PLAYER_WIDTH, PLAYER_HEIGHT)
-    enemies = []
-    bullets = []
+    if playback is not None:
+        seed = playback.seed
+    state = GameState(seed)
     stars = create_stars()
-    score = 0
-    enemy_spawn_timer = 0
+    if recorder:
+        recorder.start(state.seed, simulation_config())
+    if renderer:
+        renderer.invalidate()  # the first frame replaces the game over screen
     
     running = True
+    accumulator = 0.0
+    fire_pending = False  # a SPACE press waits for the next simulation tick
+    frame_seconds = 0.0
+    clock.tick()  # don't count the time spent before the game started
     
     while running:
+        frame_start = time.perf_counter()
+        if profiler:
+            profiler.start_frame()
+        
+        # Publish any assets the loader has finished
+        asset_loader.poll()
+        
         # --- 1. HANDLE EVENTS ---
-        for event in pygame.event.get():
+        for event in input_state.pump():
             if event.type == pygame.QUIT:
                 running = False
                 return False  # Don't restart
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    shoot_bullet(player_rect, bullets)
+                    fire_pending = True
+                elif event.key == pygame.K_F3 and profiler:
+                    profiler.toggle()
+                    if renderer:
+                        renderer.invalidate()  # erase the overlay
         
-        # --- 2. UPDATE GAME STATE ---
-        # Player movement
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and player_rect.left > 0:
-            player_rect.x -= PLAYER_SPEED
-        if keys[pygame.K_RIGHT] and player_rect.right < SCREEN_WIDTH:
-            player_rect.x += PLAYER_SPEED
-        
-        # Update visual effects
-        update_stars(stars)
-        
-        # Spawn enemies with increasing difficulty
-        enemy_spawn_timer += 1
-        spawn_rate = max(20, 60 - score // 3)  # Gets faster as score increases
-        if enemy_spawn_timer >= spawn_rate:
-            spawn_enemy(enemies)
-            enemy_spawn_timer = 0
+        inputs = input_state.held  # LEFT/RIGHT bits from KEYDOWN/KEYUP
+        if profiler:
+            profiler.mark("events")
         
-        # Update game objects
-        update_enemies(enemies)
-        update_bullets(bullets)
+        # --- 2. UPDATE GAME STATE ---
+        # Run as many fixed ticks as the elapsed time covers
+        score_before = state.score
+        while accumulator >= TICK_SECONDS and not state.game_over:
+            accumulator -= TICK_SECONDS
+            tick_inputs = inputs
+            if fire_pending:
+                tick_inputs |= INPUT_FIRE
+                fire_pending = False
+            if playback is not None:
+                if state.tick >= len(playback):
+                    print("Replay finished")
+                    return False
+                tick_inputs = playback[state.tick]
+            if recorder:
+                recorder.record(tick_inputs)
+            step_simulation(state, tick_inputs, profiler)
+            if tick_inputs & INPUT_FIRE:
+                play_sound("shoot")
+        if state.score > score_before:
+            play_sound("explosion")
+        alpha = min(1.0, accumulator / TICK_SECONDS)
         
-        # Check collisions
-        score += check_bullet_enemy_collision(bullets, enemies)
+        # Update visual effects (the stars stay still in dirty-rect mode,
+        # a scrolling background would damage the whole screen every frame)
+        if not renderer:
+            update_stars(stars, frame_seconds * SIM_RATE)
+        if profiler:
+            profiler.mark("stars")
         
-        if check_player_enemy_collision(player_rect, enemies):
+        if state.game_over:
             # Update high score
-            if score > high_score:
-                high_score = score
+            if state.score > high_score:
+                high_score = state.score
             
-            print(f"GAME OVER! Final Score: {score}")
+            print(f"GAME OVER! Final Score: {state.score}")
+            play_sound("game_over")
+            if score_store and playback is None:
+                score_store.submit(state.score, state.seed, state.tick)
+            if recorder:
+                recorder.save(state.score)
+                print(f"Replay saved to {recorder.path}")
             running = False
         
         # --- 3. DRAW EVERYTHING ---
-        draw_game(screen, player_rect, enemies, bullets, stars, score, high_score)
+        if state.game_over:
+            alpha = 1.0  # show the final tick as it is
+        player_x = state.prev_player_x + (state.player_x - state.prev_player_x) * alpha
+        player_draw_rect = state.player_rect.move(round(player_x) - state.player_rect.x, 0)
+        draw_game(screen, player_draw_rect, state.enemies, state.bullets, stars,
+                  state.score, high_score, renderer, profiler, alpha, governor)
+        
+        # Adjust quality from how long this frame's work took
+        if governor:
+            work_ms = (time.perf_counter() - frame_start) * 1000
+            if governor.record(work_ms) and renderer:
+                renderer.invalidate()
         
         # --- 4. CONTROL FRAME RATE ---
-        clock.tick(FPS)
+        frame_seconds = min(clock.tick(FPS) / 1000, MAX_FRAME_SECONDS)
+        accumulator += frame_seconds
+        if profiler:
+            profiler.mark("wait")
+            profiler.end_frame()
     
     # Show game over screen and check for restart
-    return show_game_over_screen(screen, stars, score, high_score)
+    return show_game_over_screen(screen, stars, state.score, high_score)
 
 # --- Main Program ---
+def seed_arg(text):
+    """argparse type for --seed: an integer that fits in a replay header"""
+    seed = int(text)
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {MAX_SEED}")
+    return seed
+
 def main():
     """Main program with restart functionality"""
+    global renderer, profiler, profile_path, governor, score_store, high_score
+    global STARFIELD_BACKEND, STAR_DENSITY, FPS, GAME_OVER_FPS
+    
+    parser = argparse.ArgumentParser(description="Space Game Tutorial 5")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only update the changed parts of the screen")
+    parser.add_argument("--seed", type=seed_arg, default=None,
+                        help="RNG seed for the first game (0 to 2**64 - 1)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save a replay of the latest game to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a replay file before starting a normal game")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="frame rate cap (the simulation always runs at SIM_RATE)")
+    parser.add_argument("--idle-fps", type=int, default=GAME_OVER_FPS,
+                        help="star animation rate on the game over screen (0 = no animation)")
+    parser.add_argument("--stars", choices=["layers", "numpy"], default=STARFIELD_BACKEND,
+                        help="starfield implementation")
+    parser.add_argument("--star-density", type=int, default=STAR_DENSITY,
+                        help="multiply the number of stars in every layer")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="drop visual features automatically when frames get slow")
+    parser.add_argument("--degrade-ms", type=float, default=QUALITY_DEGRADE_MS,
+                        help="average frame work time that triggers a quality drop")
+    parser.add_argument("--restore-ms", type=float, default=QUALITY_RESTORE_MS,
+                        help="average frame work time that restores quality")
+    parser.add_argument("--scores", metavar="PATH", default=SCORES_PATH,
+                        help="high score database (default: highscores.db next to this script)")
+    parser.add_argument("--no-scores", action="store_true",
+                        help="don't load or save high scores")
+    parser.add_argument("--startup-times", action="store_true",
+                        help="print how long each startup step took")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each frame phase and show the overlay (F3 toggles)")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="also write every game's per-frame timings to PATH "
+                             "(.csv or .json) when the program exits")
+    args = parser.parse_args()
+    FPS = args.fps
+    GAME_OVER_FPS = args.idle_fps
+    STARFIELD_BACKEND = args.stars
+    STAR_DENSITY = args.star_density
+    if args.profile or args.profile_out:
+        profiler = FrameProfiler(keep_history=bool(args.profile_out))
+        profile_path = args.profile_out
+    if args.adaptive_quality:
+        governor = QualityGovernor(QUALITY_LADDER, args.degrade_ms, args.restore_ms)
+    if args.dirty_rects:
+        renderer = DirtyRectRenderer((SCREEN_WIDTH, SCREEN_HEIGHT), DIRTY_RECT_THRESHOLD)
+    if not args.no_scores:
+        try:
+            score_store = ScoreStore(args.scores)
+            high_score = score_store.best()
+        except sqlite3.Error as e:
+            # Play on without a leaderboard rather than not at all
+            print(f"High scores disabled, can't use {args.scores}: {e}")
+            if score_store:
+                score_store.close()
+            score_store = None
+    recorder = InputRecorder(args.record) if args.record else None
+    playback = None
+    if args.replay:
+        try:
+            playback = load_replay(args.replay)
+        except (OSError, ReplayError) as e:
+            parser.error(str(e))
+    if playback is not None:
+        mismatches = playback.mismatches(simulation_config())
+        if mismatches:
+            parser.error(f"{args.replay} would not play back the same: " + "; ".join(mismatches))
+    
+    init_game()
+    if args.startup_times:
+        print("Startup times:")
+        for phase, ms in startup_times.items():
+            print(f"  {phase:<12} {ms:7.1f} ms")
+        print(f"  {'total':<12} {sum(startup_times.values()):7.1f} ms")
+        asset_loader.log = print  # report each asset as it arrives
+    
     print("Tutorial 5: Complete Space Game")
     print("Features:")
     print("  - Full game with restart functionality")
@@ -333,13 +821,15 @@ def main():
     print("  Q/ESC - Quit (on game over)")
     
     # Main game loop with restart capability
+    seed = args.seed
     while True:
-        restart = game_loop()
+        restart = game_loop(seed, recorder, playback)
         if not restart:
             break
+        seed = None
+        playback = None
     
-    pygame.quit()
-    sys.exit()
+    quit_game()
 
 # --- Start the Game ---
 if __name__ == "__main__":
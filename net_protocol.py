@@ -0,0 +1,144 @@
+# Network Protocol
+# Binary messages exchanged by netplay.py over TCP. Every message is a
+# uint32 length followed by the payload; the payload's first byte is its
+# type. All integers are little-endian.
+#
+# Snapshots are delta-compressed against the previous snapshot sent to
+# the same client (TCP delivers every one, so that is what the client
+# holds). Enemies and bullets move at a fixed speed, so the client moves
+# the entities it already knows by itself and a delta only lists:
+#   - entity ids that disappeared
+#   - new entities (id, kind, x, y)
+#   - entities that are not where constant motion puts them (id, x, y)
+# A snapshot with base tick NO_BASE is a full one (every entity is "new").
+
+import struct
+
+# --- Message Types ---
+MSG_WELCOME = 1
+MSG_INPUT = 2
+MSG_SNAPSHOT = 3
+
+# --- Entity Kinds ---
+KIND_ENEMY = 0
+KIND_BULLET = 1
+
+NO_BASE = 0xFFFFFFFF
+# Largest payload read_message accepts by default (a snapshot of a busy
+# game is a few kB), so a bad length can't make the reader buffer gigabytes
+MAX_MESSAGE = 1 << 20
+
+# --- Layouts ---
+LENGTH = struct.Struct("<I")
+# type, player id, sim rate, ticks per snapshot, player/enemy/bullet speed
+WELCOME = struct.Struct("<BBHBBBB")
+# type, input sequence number, INPUT_* bits
+INPUT = struct.Struct("<BIB")
+# type, tick, base tick, score, player count
+SNAPSHOT = struct.Struct("<BIIiB")
+# player id, x, alive, last input sequence applied
+PLAYER = struct.Struct("<BhBI")
+# removed, added, corrected counts
+COUNTS = struct.Struct("<HHH")
+ADDED = struct.Struct("<IBhh")
+CORRECTED = struct.Struct("<Ihh")
+
+
+class ProtocolError(Exception):
+    """Raised when a message can't be decoded or doesn't fit the client's state"""
+
+
+def frame(payload):
+    """Prefix a payload with its length"""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader, limit=MAX_MESSAGE):
+    """Read one length-prefixed payload (at most limit bytes) from an asyncio StreamReader"""
+    header = await reader.readexactly(LENGTH.size)
+    (length,) = LENGTH.unpack(header)
+    if length > limit:
+        raise ProtocolError(f"Message of {length} bytes is over the {limit} byte limit")
+    return await reader.readexactly(length)
+
+
+def predict(kind, x, y, ticks, speeds):
+    """Where constant motion puts an entity after ticks"""
+    return x, y + speeds[kind] * ticks
+
+
+def diff_entities(base, base_tick, current, tick, speeds):
+    """Return (removed ids, added entries, corrected entries) from base to current.
+
+    base and current map entity id -> (kind, x, y); base may be None for a
+    full snapshot.
+    """
+    if base is None:
+        return [], [(eid, kind, x, y) for eid, (kind, x, y) in current.items()], []
+    ticks = tick - base_tick
+    removed = [eid for eid in base if eid not in current]
+    added = []
+    corrected = []
+    for eid, (kind, x, y) in current.items():
+        old = base.get(eid)
+        if old is None:
+            added.append((eid, kind, x, y))
+        elif predict(old[0], old[1], old[2], ticks, speeds) != (x, y):
+            corrected.append((eid, x, y))
+    return removed, added, corrected
+
+
+def encode_snapshot(tick, base_tick, score, players, removed, added, corrected):
+    """Pack a snapshot; players is a list of (id, x, alive, last input seq)"""
+    parts = [SNAPSHOT.pack(MSG_SNAPSHOT, tick, base_tick, score, len(players))]
+    parts.extend(PLAYER.pack(pid, x, alive, seq) for pid, x, alive, seq in players)
+    parts.append(COUNTS.pack(len(removed), len(added), len(corrected)))
+    if removed:
+        parts.append(struct.pack(f"<{len(removed)}I", *removed))
+    parts.extend(ADDED.pack(*entry) for entry in added)
+    parts.extend(CORRECTED.pack(*entry) for entry in corrected)
+    return b"".join(parts)
+
+
+def decode_snapshot(data):
+    """Unpack a snapshot into a dict"""
+    try:
+        _, tick, base_tick, score, player_count = SNAPSHOT.unpack_from(data)
+        offset = SNAPSHOT.size
+        players = []
+        for _ in range(player_count):
+            players.append(PLAYER.unpack_from(data, offset))
+            offset += PLAYER.size
+        removed_count, added_count, corrected_count = COUNTS.unpack_from(data, offset)
+        offset += COUNTS.size
+        removed = struct.unpack_from(f"<{removed_count}I", data, offset)
+        offset += 4 * removed_count
+        added = [ADDED.unpack_from(data, offset + i * ADDED.size) for i in range(added_count)]
+        offset += ADDED.size * added_count
+        corrected = [CORRECTED.unpack_from(data, offset + i * CORRECTED.size)
+                     for i in range(corrected_count)]
+    except struct.error as e:
+        raise ProtocolError(f"Bad snapshot: {e}")
+    return {"tick": tick, "base_tick": base_tick, "score": score, "players": players,
+            "removed": removed, "added": added, "corrected": corrected}
+
+
+def apply_snapshot(base, base_tick, snapshot, speeds):
+    """Rebuild the full entity dict a snapshot describes from the client's base"""
+    if snapshot["base_tick"] == NO_BASE:
+        entities = {}
+    elif base is None or snapshot["base_tick"] != base_tick:
+        raise ProtocolError(f"Snapshot is based on tick {snapshot['base_tick']}, "
+                            f"client has {base_tick}")
+    else:
+        ticks = snapshot["tick"] - base_tick
+        removed = set(snapshot["removed"])
+        entities = {eid: (kind,) + predict(kind, x, y, ticks, speeds)
+                    for eid, (kind, x, y) in base.items() if eid not in removed}
+    for eid, kind, x, y in snapshot["added"]:
+        entities[eid] = (kind, x, y)
+    for eid, x, y in snapshot["corrected"]:
+        if eid not in entities:
+            raise ProtocolError(f"Correction for unknown entity {eid}")
+        entities[eid] = (entities[eid][0], x, y)
+    return entities
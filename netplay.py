@@ -0,0 +1,538 @@
+# Networked Co-op
+# An authoritative server runs one shared Tutorial 5 world without a
+# display: every connected client flies its own ship, the asteroids,
+# bullets and score are shared, and a ship that gets hit respawns after
+# a few seconds. Clients send one input message per tick and receive
+# delta snapshots (see net_protocol.py) SNAPSHOT_RATE times a second.
+# They predict their own ship from the inputs the server hasn't applied
+# yet and draw everything else interpolated between snapshots.
+#
+#   python netplay.py --clients 4 --seconds 10        # server + bots on localhost
+#   python netplay.py --serve --port 5555             # server only
+#   python netplay.py --connect 10.0.0.2 --clients 8  # bots against a server
+
+import os
+
+# Must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import struct
+import time
+from collections import deque
+
+import pygame
+
+import headless
+from net_protocol import (INPUT, KIND_BULLET, KIND_ENEMY, MSG_INPUT, MSG_SNAPSHOT,
+                          MSG_WELCOME, NO_BASE, WELCOME, ProtocolError, apply_snapshot,
+                          decode_snapshot, diff_entities, encode_snapshot, frame,
+                          predict, read_message)
+from profiler import percentile
+
+game = headless.game
+
+# --- Constants ---
+DEFAULT_PORT = 5555
+SNAPSHOT_RATE = 20  # snapshots per second
+INTERP_TICKS = 6  # clients draw this many ticks behind the newest snapshot
+RESPAWN_SECONDS = 3
+MAX_PLAYERS = 16
+MAX_CLIENT_MESSAGE = 64  # clients only send inputs; anything longer is dropped
+MAX_QUEUED_INPUTS = 8  # a client further ahead than this loses its oldest inputs
+MAX_BUFFERED = 64 * 1024  # skip snapshots for a client whose socket is this far behind
+TIMING_SAMPLES = 100000  # most recent tick/snapshot timings kept for the report
+
+
+def entity_speeds():
+    """Vertical pixels per tick for each entity kind"""
+    return [game.ENEMY_SPEED, -game.BULLET_SPEED]
+
+
+def move_player(x, bits, speed):
+    """One tick of ship movement, as in step_simulation"""
+    if bits & game.INPUT_LEFT and x > 0:
+        x -= speed
+    if bits & game.INPUT_RIGHT and x + game.PLAYER_WIDTH < game.SCREEN_WIDTH:
+        x += speed
+    return x
+
+
+# --- Server ---
+class NetPlayer:
+    """One ship in the shared world and the inputs waiting for it"""
+
+    def __init__(self, pid, x):
+        self.pid = pid
+        self.x = float(x)
+        self.rect = pygame.Rect(int(x), game.SCREEN_HEIGHT - game.PLAYER_HEIGHT - 10,
+                                game.PLAYER_WIDTH, game.PLAYER_HEIGHT)
+        self.alive = True
+        self.respawn = 0
+        self.inputs = deque(maxlen=MAX_QUEUED_INPUTS)
+        self.last_seq = 0
+        self.held = 0
+
+    def next_input(self):
+        """Input bits for this tick; holds the last movement if none arrived"""
+        if self.inputs:
+            self.last_seq, bits = self.inputs.popleft()
+            self.held = bits & ~game.INPUT_FIRE
+            return bits
+        return self.held
+
+
+class NetWorld:
+    """The shared simulation, stepped like step_simulation but for many ships.
+
+    Enemies and bullets are kept in plain lists of Rects so each entity
+    keeps the same Rect object for its whole life; that identity is what
+    gives it a stable network id.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.enemies = []
+        self.bullets = []
+        self.players = {}
+        self.score = 0
+        self.enemy_spawn_timer = 0
+        self.tick = 0
+        self.entity_ids = {}  # id(rect) -> (network id, rect)
+        self.next_id = 0
+
+    def add_player(self, pid):
+        """Add a ship; ships start spread across the bottom of the screen"""
+        slot = pid % MAX_PLAYERS + 1
+        x = game.SCREEN_WIDTH * slot // (MAX_PLAYERS + 1) - game.PLAYER_WIDTH // 2
+        self.players[pid] = NetPlayer(pid, x)
+        return self.players[pid]
+
+    def remove_player(self, pid):
+        self.players.pop(pid, None)
+
+    def step(self):
+        """Advance the world by one tick"""
+        for player in self.players.values():
+            if not player.alive:
+                player.respawn -= 1
+                if player.respawn <= 0:
+                    player.alive = True
+                player.next_input()  # inputs sent while dead are still used up
+                continue
+            bits = player.next_input()
+            if bits & game.INPUT_FIRE:
+                game.shoot_bullet(player.rect, self.bullets)
+            player.x = move_player(player.x, bits, game.PLAYER_SPEED)
+            player.rect.x = int(player.x)
+
+        self.enemy_spawn_timer += 1
+        spawn_rate = max(game.SPAWN_RATE_MIN,
+                         game.SPAWN_RATE_START - self.score // game.SPAWN_RATE_DIVISOR)
+        if self.enemy_spawn_timer >= spawn_rate:
+            game.spawn_enemy(self.enemies, self.rng)
+            self.enemy_spawn_timer = 0
+
+        game.update_enemies(self.enemies)
+        game.update_bullets(self.bullets)
+        self.score += game.check_bullet_enemy_collision(self.bullets, self.enemies)
+        for player in self.players.values():
+            if player.alive and game.check_player_enemy_collision(player.rect, self.enemies):
+                player.alive = False
+                player.respawn = RESPAWN_SECONDS * game.SIM_RATE
+        self.tick += 1
+
+    def entities(self):
+        """Every enemy and bullet as {network id: (kind, x, y)}"""
+        seen = {}
+        current = {}
+        for kind, rects in ((KIND_ENEMY, self.enemies), (KIND_BULLET, self.bullets)):
+            for rect in rects:
+                key = id(rect)
+                entry = self.entity_ids.get(key)
+                if entry is None or entry[1] is not rect:
+                    entry = (self.next_id, rect)
+                    self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+                # Holding the rect keeps its id() from being reused until
+                # the next snapshot has seen it gone
+                seen[key] = entry
+                current[entry[0]] = (kind, rect.x, rect.y)
+        self.entity_ids = seen
+        return current
+
+    def player_states(self):
+        return [(p.pid, int(p.x), p.alive, p.last_seq) for p in self.players.values()]
+
+
+class ClientConnection:
+    """Server-side view of one client"""
+
+    def __init__(self, pid, writer):
+        self.pid = pid
+        self.writer = writer
+        self.base = None  # entities of the last snapshot sent
+        self.base_tick = NO_BASE
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.skipped = 0
+        self.connected_at = time.perf_counter()
+        self.closed_at = None
+
+
+class NetServer:
+    """Accepts clients, steps the world at SIM_RATE and sends snapshots"""
+
+    def __init__(self, world, snapshot_rate=SNAPSHOT_RATE, delta=True):
+        self.world = world
+        self.every = max(1, game.SIM_RATE // snapshot_rate)
+        self.delta = delta
+        self.clients = {}
+        self.finished = []  # connections that have closed
+        self.tick_us = deque(maxlen=TIMING_SAMPLES)
+        self.snapshot_us = deque(maxlen=TIMING_SAMPLES)
+        self.running = False
+
+    async def handle_client(self, reader, writer):
+        """Connection callback for asyncio.start_server"""
+        pid = next((i for i in range(MAX_PLAYERS) if i not in self.clients), None)
+        if pid is None:
+            writer.close()
+            return
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        conn = ClientConnection(pid, writer)
+        self.clients[pid] = conn
+        player = self.world.add_player(pid)
+        welcome = frame(WELCOME.pack(MSG_WELCOME, pid, game.SIM_RATE, self.every,
+                                     game.PLAYER_SPEED, game.ENEMY_SPEED, game.BULLET_SPEED))
+        writer.write(welcome)
+        conn.bytes_sent += len(welcome)
+        try:
+            while True:
+                data = await read_message(reader, MAX_CLIENT_MESSAGE)
+                conn.bytes_received += len(data) + 4
+                if not data:
+                    raise ProtocolError("Empty message")
+                if data[0] == MSG_INPUT:
+                    if len(data) != INPUT.size:
+                        raise ProtocolError(f"Input message of {len(data)} bytes")
+                    _, seq, bits = INPUT.unpack(data)
+                    player.inputs.append((seq, bits))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ProtocolError, struct.error) as e:
+            print(f"Dropping client {pid}: {e}")
+        finally:
+            del self.clients[pid]
+            conn.closed_at = time.perf_counter()
+            self.finished.append(conn)
+            self.world.remove_player(pid)
+            writer.close()
+
+    def broadcast(self):
+        """Send every client a snapshot, delta-compressed against its last one"""
+        start = time.perf_counter()
+        world = self.world
+        current = world.entities()
+        players = world.player_states()
+        speeds = entity_speeds()
+        encoded = {}  # base tick -> framed snapshot; clients usually share one
+        for conn in self.clients.values():
+            if conn.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                conn.skipped += 1  # the next delta is just against an older base
+                continue
+            base_tick = conn.base_tick if self.delta else NO_BASE
+            payload = encoded.get(base_tick)
+            if payload is None:
+                base = conn.base if base_tick != NO_BASE else None
+                removed, added, corrected = diff_entities(base, base_tick, current, world.tick, speeds)
+                payload = frame(encode_snapshot(world.tick, base_tick, world.score, players,
+                                                removed, added, corrected))
+                encoded[base_tick] = payload
+            conn.writer.write(payload)
+            conn.bytes_sent += len(payload)
+            conn.snapshots += 1
+            conn.base = current
+            conn.base_tick = world.tick
+        self.snapshot_us.append((time.perf_counter() - start) * 1e6)
+
+    async def run(self, seconds=None):
+        """Step the world in real time until stop() or seconds pass"""
+        loop = asyncio.get_running_loop()
+        interval = 1 / game.SIM_RATE
+        next_time = loop.time()
+        end = None if seconds is None else next_time + seconds
+        self.running = True
+        while self.running and (end is None or loop.time() < end):
+            start = time.perf_counter()
+            self.world.step()
+            self.tick_us.append((time.perf_counter() - start) * 1e6)
+            if self.world.tick % self.every == 0 and self.clients:
+                self.broadcast()
+            next_time += interval
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+    def stop(self):
+        self.running = False
+
+    def report(self):
+        """Print tick cost and per-client traffic"""
+        print(f"Server: {self.world.tick} ticks, score {self.world.score}, "
+              f"{'delta' if self.delta else 'full'} snapshots every {self.every} ticks")
+        print(f"  tick     mean {statistics.mean(self.tick_us or [0]):7.1f} us"
+              f"  p99 {percentile(self.tick_us, 0.99):7.1f} us  max {max(self.tick_us or [0]):7.1f} us")
+        print(f"  snapshot mean {statistics.mean(self.snapshot_us or [0]):7.1f} us"
+              f"  p99 {percentile(self.snapshot_us, 0.99):7.1f} us (all clients)")
+        for conn in sorted(self.finished + list(self.clients.values()), key=lambda c: c.pid):
+            end = conn.closed_at or time.perf_counter()
+            seconds = max(1e-9, end - conn.connected_at)
+            print(f"  client {conn.pid}: down {conn.bytes_sent / seconds / 1024:6.2f} KiB/s"
+                  f"  up {conn.bytes_received / seconds / 1024:6.2f} KiB/s"
+                  f"  {conn.snapshots} snapshots, {conn.skipped} skipped")
+
+
+# --- Client ---
+class NetClient:
+    """Receives snapshots, predicts its own ship and interpolates the rest"""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.pid = None
+        self.sim_rate = game.SIM_RATE
+        self.player_speed = game.PLAYER_SPEED
+        self.speeds = entity_speeds()
+        self.snapshots = deque(maxlen=8)  # (tick, entities, players, score, receive time)
+        self.base = None
+        self.base_tick = NO_BASE
+        self.seq = 0
+        self.pending = deque()  # (seq, bits) sent but not yet applied by the server
+        self.x = None  # predicted x of our ship
+        self.alive = True
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.snapshot_sizes = []
+        self.corrections = []  # pixels the prediction was off by, per snapshot
+        self.underruns = 0  # views that had to extrapolate past the newest snapshot
+        self.view_us = []
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data = await read_message(self.reader)
+        self.bytes_received += len(data) + 4
+        msg, self.pid, self.sim_rate, _, self.player_speed, enemy_speed, bullet_speed = WELCOME.unpack(data)
+        if msg != MSG_WELCOME:
+            raise ProtocolError(f"Expected a welcome message, got type {msg}")
+        self.speeds = [enemy_speed, -bullet_speed]
+
+    def send_input(self, bits):
+        """Send one tick of input and apply it to our ship right away"""
+        self.seq += 1
+        self.pending.append((self.seq, bits))
+        if self.x is not None and self.alive:
+            self.x = move_player(self.x, bits, self.player_speed)
+        payload = frame(INPUT.pack(MSG_INPUT, self.seq, bits))
+        self.writer.write(payload)
+        self.bytes_sent += len(payload)
+
+    async def receive(self):
+        """Read snapshots until the server closes the connection"""
+        try:
+            while True:
+                data = await read_message(self.reader)
+                self.bytes_received += len(data) + 4
+                if data[0] == MSG_SNAPSHOT:
+                    self.on_snapshot(decode_snapshot(data), len(data) + 4)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def on_snapshot(self, snapshot, size):
+        entities = apply_snapshot(self.base, self.base_tick, snapshot, self.speeds)
+        self.base = entities
+        self.base_tick = snapshot["tick"]
+        self.snapshot_sizes.append(size)
+        players = {pid: (x, alive, seq) for pid, x, alive, seq in snapshot["players"]}
+        self.snapshots.append((snapshot["tick"], entities, players, snapshot["score"],
+                               time.perf_counter()))
+        if self.pid in players:
+            self.reconcile(*players[self.pid])
+
+    def reconcile(self, server_x, alive, ack):
+        """Start from the server's position and replay the unapplied inputs"""
+        while self.pending and self.pending[0][0] <= ack:
+            self.pending.popleft()
+        self.alive = alive
+        x = float(server_x)
+        if alive:
+            for _, bits in self.pending:
+                x = move_player(x, bits, self.player_speed)
+        if self.x is not None:
+            self.corrections.append(abs(x - self.x))
+        self.x = x
+
+    def view(self, now=None):
+        """Positions to draw now: (our x, {pid: x} of others, enemy rects, bullet rects, score)"""
+        start = time.perf_counter()
+        if not self.snapshots:
+            return self.x, {}, [], [], 0
+        if now is None:
+            now = start
+        newest_tick, _, _, score, received = self.snapshots[-1]
+        render_tick = newest_tick + (now - received) * self.sim_rate - INTERP_TICKS
+
+        # The two snapshots around render_tick (or the nearest one)
+        older = newer = None
+        for snap in self.snapshots:
+            if snap[0] <= render_tick:
+                older = snap
+            elif newer is None:
+                newer = snap
+        if newer is None:
+            self.underruns += 1
+            newer = older
+        if older is None:
+            older = newer
+        span = newer[0] - older[0]
+        t = (render_tick - older[0]) / span if span else 0.0
+
+        enemies = []
+        bullets = []
+        old_entities = older[1]
+        for eid, (kind, x, y) in newer[1].items():
+            if span == 0:
+                x, y = predict(kind, x, y, render_tick - newer[0], self.speeds)
+            elif eid in old_entities:
+                _, ox, oy = old_entities[eid]
+                x = ox + (x - ox) * t
+                y = oy + (y - oy) * t
+            if kind == KIND_ENEMY:
+                enemies.append(pygame.Rect(round(x), round(y), game.ENEMY_WIDTH, game.ENEMY_HEIGHT))
+            else:
+                bullets.append(pygame.Rect(round(x), round(y), game.BULLET_WIDTH, game.BULLET_HEIGHT))
+
+        others = {}
+        for pid, (x, alive, _) in newer[2].items():
+            if pid == self.pid or not alive:
+                continue
+            if pid in older[2]:
+                x = older[2][pid][0] + (x - older[2][pid][0]) * t
+            others[pid] = x
+        self.view_us.append((time.perf_counter() - start) * 1e6)
+        return self.x, others, enemies, bullets, score
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+# --- Simulated Clients ---
+async def run_bot(host, port, seconds, seed=None, fire_chance=0.1):
+    """Connect, play random inputs at SIM_RATE and draw a view every tick"""
+    rng = random.Random(seed)
+    client = NetClient()
+    await client.connect(host, port)
+    receiver = asyncio.create_task(client.receive())
+    loop = asyncio.get_running_loop()
+    interval = 1 / client.sim_rate
+    next_time = loop.time()
+    end = next_time + seconds
+    move = 0
+    while loop.time() < end and not receiver.done():
+        if rng.random() < 0.05:
+            move = rng.choice((0, game.INPUT_LEFT, game.INPUT_RIGHT))
+        bits = move | (game.INPUT_FIRE if rng.random() < fire_chance else 0)
+        client.send_input(bits)
+        client.view()
+        next_time += interval
+        await asyncio.sleep(max(0.0, next_time - loop.time()))
+    client.close()
+    receiver.cancel()
+    return client, seconds
+
+
+def report_clients(results):
+    """Print what each simulated client received and how well it predicted"""
+    for client, seconds in results:
+        sizes = client.snapshot_sizes or [0]
+        corrections = client.corrections or [0]
+        print(f"  bot {client.pid}: down {client.bytes_received / seconds / 1024:6.2f} KiB/s"
+              f"  up {client.bytes_sent / seconds / 1024:5.2f} KiB/s"
+              f"  snapshot avg {statistics.mean(sizes):6.1f} B max {max(sizes)} B"
+              f"  prediction error avg {statistics.mean(corrections):4.1f} px"
+              f"  view {statistics.mean(client.view_us or [0]):6.1f} us"
+              f"  underruns {client.underruns}")
+
+
+async def local_test(clients, seconds, port, seed, delta):
+    """Run a server and simulated clients in one process on localhost"""
+    server = NetServer(NetWorld(seed), delta=delta)
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", port)
+    port = listener.sockets[0].getsockname()[1]
+    ticking = asyncio.create_task(server.run())
+    results = await asyncio.gather(*(run_bot("127.0.0.1", port, seconds, seed=i)
+                                     for i in range(clients)))
+    await asyncio.sleep(0.1)  # let the server notice the disconnects
+    server.stop()
+    await ticking
+    listener.close()
+    await listener.wait_closed()
+    server.report()
+    print("Clients:")
+    report_clients(results)
+
+
+async def serve(port, seed, delta):
+    server = NetServer(NetWorld(seed), delta=delta)
+    listener = await asyncio.start_server(server.handle_client, "0.0.0.0", port)
+    print(f"Serving on port {port} (Ctrl+C to stop)")
+    try:
+        await server.run()
+    finally:
+        listener.close()
+        server.report()
+
+
+async def bots(host, port, clients, seconds):
+    results = await asyncio.gather(*(run_bot(host, port, seconds, seed=i) for i in range(clients)))
+    print("Clients:")
+    report_clients(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authoritative co-op server and simulated clients")
+    parser.add_argument("--serve", action="store_true", help="only run the server")
+    parser.add_argument("--connect", metavar="HOST", help="run bots against a server at HOST")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="server port for --serve and --connect")
+    parser.add_argument("--clients", type=int, default=4, help="number of simulated clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long the bots play")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the shared world")
+    parser.add_argument("--full-snapshots", action="store_true",
+                        help="send full snapshots instead of deltas (for comparison)")
+    args = parser.parse_args()
+
+    delta = not args.full_snapshots
+    try:
+        if args.serve:
+            asyncio.run(serve(args.port, args.seed, delta))
+        elif args.connect:
+            asyncio.run(bots(args.connect, args.port, args.clients, args.seconds))
+        else:
+            asyncio.run(local_test(args.clients, args.seconds, 0, args.seed, delta))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
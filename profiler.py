@@ -0,0 +1,144 @@
+# Frame Profiler
+# Times each phase of a frame with perf_counter_ns, keeps rolling
+# statistics for an on-screen overlay and can dump every frame's timings
+# to CSV or JSON.
+#
+# Usage inside a loop:
+#   profiler.start_frame()
+#   ...handle events...      profiler.mark("events")
+#   ...update...             profiler.mark("update")
+#   profiler.end_frame()
+
+import csv
+import json
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+# --- Constants ---
+DEFAULT_WINDOW = 240  # frames used for rolling averages and the graph
+TARGET_FRAME_MS = 1000 / 60
+OVERLAY_WIDTH = 300
+GRAPH_HEIGHT = 60
+OVERLAY_BG = (0, 0, 0)
+OVERLAY_TEXT = (255, 255, 255)
+GRAPH_COLOR = (0, 255, 0)
+GRAPH_SLOW_COLOR = (255, 0, 0)
+TARGET_LINE_COLOR = (255, 255, 0)
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction (0-1) of the sorted values"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+class FrameProfiler:
+    """Per-phase frame timer with rolling stats, overlay and export"""
+
+    def __init__(self, window=DEFAULT_WINDOW, keep_history=False):
+        self.window = window
+        self.keep_history = keep_history
+        self.visible = True
+        self.phases = {}  # phase name -> deque of recent ns timings
+        self.frame_times = deque(maxlen=window)
+        self.history = []  # one dict per frame when keep_history is set
+        self.frames = 0
+        self._current = {}
+        self._frame_start = 0
+        self._last = 0
+
+    # --- Timing ---
+    def start_frame(self):
+        """Begin timing a new frame"""
+        self._frame_start = self._last = perf_counter_ns()
+        self._current = {}
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase"""
+        now = perf_counter_ns()
+        self._current[phase] = self._current.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Finish the frame and fold its timings into the rolling stats"""
+        total = perf_counter_ns() - self._frame_start
+        self.frame_times.append(total)
+        for phase, ns in self._current.items():
+            times = self.phases.get(phase)
+            if times is None:
+                times = self.phases[phase] = deque(maxlen=self.window)
+            times.append(ns)
+        if self.keep_history:
+            row = {"frame": self.frames, "total_ns": total}
+            row.update(self._current)
+            self.history.append(row)
+        self.frames += 1
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+
+    # --- Stats ---
+    def stats(self):
+        """Return {phase: (average ms, p99 ms)} including a "frame" total"""
+        result = {}
+        for phase, times in list(self.phases.items()) + [("frame", self.frame_times)]:
+            if times:
+                result[phase] = (sum(times) / len(times) / 1e6,
+                                 percentile(times, 0.99) / 1e6)
+        return result
+
+    # --- Overlay ---
+    def draw_overlay(self, screen, text_cache, topleft=(10, 170)):
+        """Draw the stats table and frame-time graph; return the area used"""
+        stats = self.stats()
+        line_height = 18
+        height = (len(stats) + 1) * line_height + GRAPH_HEIGHT + 15
+        area = pygame.Rect(topleft, (OVERLAY_WIDTH, height))
+        pygame.draw.rect(screen, OVERLAY_BG, area)
+        pygame.draw.rect(screen, OVERLAY_TEXT, area, 1)
+
+        x, y = area.x + 6, area.y + 4
+        header = text_cache.render_static("phase          avg ms   p99 ms", 20, OVERLAY_TEXT)
+        screen.blit(header, (x, y))
+        for phase, (avg, p99) in stats.items():
+            y += line_height
+            line = f"{phase:<14} {avg:6.2f}   {p99:6.2f}"
+            screen.blit(text_cache.render(line, 20, OVERLAY_TEXT), (x, y))
+
+        # Frame-time graph, one column per frame, with the 60 FPS budget marked
+        graph = pygame.Rect(area.x + 6, area.bottom - GRAPH_HEIGHT - 6,
+                            OVERLAY_WIDTH - 12, GRAPH_HEIGHT)
+        scale = GRAPH_HEIGHT / (TARGET_FRAME_MS * 2)
+        times = list(self.frame_times)[-graph.width:]
+        for i, ns in enumerate(times):
+            ms = ns / 1e6
+            bar = min(GRAPH_HEIGHT, int(ms * scale))
+            color = GRAPH_SLOW_COLOR if ms > TARGET_FRAME_MS * 1.05 else GRAPH_COLOR
+            column = graph.x + i
+            pygame.draw.line(screen, color, (column, graph.bottom), (column, graph.bottom - bar))
+        target_y = graph.bottom - int(TARGET_FRAME_MS * scale)
+        pygame.draw.line(screen, TARGET_LINE_COLOR, (graph.x, target_y), (graph.right, target_y))
+        return area
+
+    # --- Export ---
+    def export(self, path):
+        """Write the per-frame history to .json or .csv (by file extension)"""
+        columns = ["frame", "total_ns"]
+        for row in self.history:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"columns": columns, "frames": self.history}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+                writer.writeheader()
+                writer.writerows(self.history)
@@ -0,0 +1,70 @@
+# Quality Governor
+# Watches how long each frame's work takes and walks a ladder of visual
+# features: when the rolling average goes over the degrade threshold the
+# next feature on the ladder is switched off, and when it drops under the
+# restore threshold the last one switched off comes back. Changes are
+# rate-limited so the quality doesn't flicker, and every change is logged.
+
+from collections import deque
+
+# --- Constants ---
+# Features in the order they are given up (first = cheapest to lose)
+DEFAULT_LADDER = ["all_stars", "bullet_glow", "hud_stats", "enemy_images"]
+DEFAULT_DEGRADE_MS = 12.0  # frame work above this (of a 16.7 ms budget) -> degrade
+DEFAULT_RESTORE_MS = 7.0  # frame work below this -> restore
+DEFAULT_WINDOW = 60  # frames averaged before deciding
+DEFAULT_COOLDOWN = 60  # frames to wait after a change
+
+
+class QualityGovernor:
+    """Turns ladder features off and on based on measured frame time"""
+
+    def __init__(self, ladder=DEFAULT_LADDER, degrade_ms=DEFAULT_DEGRADE_MS,
+                 restore_ms=DEFAULT_RESTORE_MS, window=DEFAULT_WINDOW,
+                 cooldown=DEFAULT_COOLDOWN, log=print):
+        self.ladder = list(ladder)
+        self.degrade_ms = degrade_ms
+        self.restore_ms = restore_ms
+        self.cooldown = cooldown
+        self.log = log
+        self.level = 0  # number of ladder features currently switched off
+        self.samples = deque(maxlen=window)
+        self.wait = 0
+        self.changes = []  # (frame, level, average ms) for every change
+        self.frames = 0
+
+    def enabled(self, feature):
+        """True unless the feature has been switched off"""
+        return feature not in self.ladder[:self.level]
+
+    def record(self, frame_ms):
+        """Add one frame's work time; return True if the quality level changed"""
+        self.frames += 1
+        self.samples.append(frame_ms)
+        if self.wait:
+            self.wait -= 1
+            return False
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        average = sum(self.samples) / len(self.samples)
+        if average > self.degrade_ms and self.level < len(self.ladder):
+            feature = self.ladder[self.level]
+            self.level += 1
+            self._changed(average, f"degraded: {feature} off")
+            return True
+        if average < self.restore_ms and self.level > 0:
+            self.level -= 1
+            feature = self.ladder[self.level]
+            self._changed(average, f"restored: {feature} on")
+            return True
+        return False
+
+    def _changed(self, average, message):
+        """Log a level change and start the cooldown"""
+        self.changes.append((self.frames, self.level, average))
+        self.samples.clear()
+        self.wait = self.cooldown
+        if self.log:
+            self.log(f"Quality {message} (level {self.level}/{len(self.ladder)}, "
+                     f"average frame work {average:.1f} ms)")
@@ -0,0 +1,138 @@
+# Rect Pool
+# Pool of pygame.Rect objects for enemies and bullets.
+# Live rects are kept packed at the front of the slot list; the tail is the
+# free list. Removing swaps the dead rect with the last live one, so both
+# spawning and removing are O(1) and a Rect is never allocated twice.
+# A full pool doubles its capacity (like EntityStore) rather than dropping
+# spawns, so it never changes what happens in the game.
+
+from array import array
+
+import pygame
+
+# --- Constants ---
+DEFAULT_CAPACITY = 256
+
+
+class RectPool:
+    """Recycling container of Rects with the same protocol as EntityStore.
+
+    Note that rects are reused: a Rect handed out by the pool is only valid
+    until it is removed. Copy it if you need to keep it longer.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self._slots = []
+
+        # Stats
+        self.spawned = 0
+        self.allocated = 0
+        self.grown = 0
+        self.high_water = 0
+
+    # --- Adding and removing ---
+    def spawn(self, x, y, w, h):
+        """Take a free slot and return its Rect"""
+        i = self.count
+        if i >= self.capacity:
+            self.capacity *= 2
+            self.grown += 1
+        if i == len(self._slots):
+            rect = pygame.Rect(x, y, w, h)
+            self._slots.append(rect)
+            self.allocated += 1
+        else:
+            rect = self._slots[i]
+            rect.update(x, y, w, h)
+        self.count = i + 1
+        self.spawned += 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        return rect
+
+    def append(self, rect):
+        """List-compatible add (copies the rect into a pooled slot)"""
+        self.spawn(rect.x, rect.y, rect.width, rect.height)
+
+    def remove_at(self, i):
+        """Swap-remove slot i; the last live rect takes its place"""
+        last = self.count - 1
+        slots = self._slots
+        if i != last:
+            slots[i], slots[last] = slots[last], slots[i]
+        self.count = last
+
+    def remove_indices(self, indices):
+        """Remove several slots (highest first so indices stay valid)"""
+        for i in sorted(indices, reverse=True):
+            self.remove_at(i)
+
+    def clear(self):
+        """Return every slot to the free list"""
+        self.count = 0
+
+    # --- Updates ---
+    def scroll(self, dy, top_limit=None, bottom_limit=None):
+        """Move every rect by dy and recycle the ones that left the screen"""
+        slots = self._slots
+        for i in range(self.count - 1, -1, -1):
+            rect = slots[i]
+            rect.y += dy
+            if ((bottom_limit is not None and rect.top > bottom_limit) or
+                    (top_limit is not None and rect.bottom < top_limit)):
+                self.remove_at(i)
+
+    def any_collide(self, rect):
+        """True if any live rect overlaps rect"""
+        return rect.collidelist(self._slots[:self.count]) != -1
+
+    # --- Snapshots ---
+    def positions(self):
+        """x, y of every live rect as a flat int32 array"""
+        return array("i", [v for rect in self._slots[:self.count] for v in (rect.x, rect.y)])
+
+    def load_positions(self, coords, w, h):
+        """Make the live rects exactly the given flat x, y pairs (reusing slots)"""
+        n = len(coords) // 2
+        if n > self.capacity:
+            self.capacity = max(self.capacity * 2, n)
+            self.grown += 1
+        slots = self._slots
+        while len(slots) < n:
+            slots.append(pygame.Rect(0, 0, w, h))
+            self.allocated += 1
+        values = iter(coords.tolist())
+        for rect, x, y in zip(slots, values, values):
+            rect.update(x, y, w, h)
+        self.count = n
+        self.spawned += n
+        if n > self.high_water:
+            self.high_water = n
+
+    # --- Stats ---
+    def stats(self):
+        """Return a dict of pool usage counters"""
+        return {
+            "capacity": self.capacity,
+            "live": self.count,
+            "high_water": self.high_water,
+            "allocated": self.allocated,
+            "allocations_avoided": self.spawned - self.allocated,
+            "grown": self.grown,
+        }
+
+    # --- List-like access ---
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("pool index out of range")
+        return self._slots[i]
+
+    def __iter__(self):
+        return iter(self._slots[:self.count])
@@ -0,0 +1,150 @@
+# Input Recording and Replay
+# A replay is the RNG seed of a game plus one input byte per tick
+# (INPUT_LEFT / INPUT_RIGHT / INPUT_FIRE bits). Because step_simulation only
+# depends on the seed, the inputs and the simulation settings that change
+# outcomes (collision mode, swept collisions, entity backend - stored in
+# the header too), feeding the same bytes back reproduces the game exactly,
+# in a window or headless at full speed.
+#
+#   python main_tutorial5.py --record run.rep     # play and record
+#   python main_tutorial5.py --replay run.rep     # watch it again
+#   python replay.py run.rep                      # headless check
+
+import struct
+import zlib
+
+# --- File Format ---
+# magic, version, seed, tick count, final score, collision mode, swept
+# collisions, entity backend; then zlib-compressed inputs
+REPLAY_MAGIC = b"SGRP"
+REPLAY_VERSION = 2
+HEADER = struct.Struct("<4sBQIi8s?8s")
+MAX_SEED = 2 ** 64 - 1
+
+
+class ReplayError(Exception):
+    """Raised when a replay file can't be read"""
+
+
+class Replay:
+    """A loaded replay: seed, per-tick input bytes, settings and the recorded result.
+
+    config maps the game's setting names (COLLISION_MODE, SWEPT_COLLISIONS,
+    ENTITY_BACKEND) to the values the game was recorded with.
+    """
+
+    def __init__(self, seed, inputs, final_score=-1, config=None):
+        self.seed = seed
+        self.inputs = bytes(inputs)
+        self.final_score = final_score
+        self.config = dict(config or {})
+
+    def mismatches(self, config):
+        """List the recorded settings that differ from config, as messages"""
+        return [f"{name} is {config.get(name)!r}, recorded with {value!r}"
+                for name, value in self.config.items() if config.get(name) != value]
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def __getitem__(self, tick):
+        return self.inputs[tick]
+
+
+class InputRecorder:
+    """Collects the input bitmask of every tick of one game"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.seed = 0
+        self.config = {}
+        self.inputs = bytearray()
+
+    def start(self, seed, config=None):
+        """Begin a new recording for a game using this seed and settings"""
+        self.seed = seed
+        self.config = dict(config or {})
+        self.inputs = bytearray()
+
+    def record(self, inputs):
+        """Append one tick of input"""
+        self.inputs.append(inputs)
+
+    def to_replay(self, final_score=-1):
+        """Return the recording as a Replay"""
+        return Replay(self.seed, self.inputs, final_score, self.config)
+
+    def save(self, final_score=-1, path=None):
+        """Write the recording to a replay file (self.path by default)"""
+        save_replay(path or self.path, self.to_replay(final_score))
+
+
+def save_replay(path, replay):
+    """Write a Replay to disk"""
+    if not 0 <= replay.seed <= MAX_SEED:
+        raise ReplayError(f"seed {replay.seed} doesn't fit in a replay (0 to {MAX_SEED})")
+    config = replay.config
+    header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, replay.seed,
+                         len(replay.inputs), replay.final_score,
+                         config.get("COLLISION_MODE", "").encode("ascii"),
+                         config.get("SWEPT_COLLISIONS", False),
+                         config.get("ENTITY_BACKEND", "").encode("ascii"))
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(zlib.compress(replay.inputs, 9))
+
+
+def load_replay(path):
+    """Read a replay file written by save_replay"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 5 or data[:4] != REPLAY_MAGIC:
+        raise ReplayError(f"{path}: not a replay file")
+    if data[4] != REPLAY_VERSION:
+        raise ReplayError(f"{path}: unsupported replay version {data[4]}")
+    if len(data) < HEADER.size:
+        raise ReplayError(f"{path}: file too short")
+    _, _, seed, ticks, final_score, collision_mode, swept, backend = HEADER.unpack_from(data)
+    try:
+        inputs = zlib.decompress(data[HEADER.size:])
+    except zlib.error as e:
+        raise ReplayError(f"{path}: corrupt input data ({e})")
+    if len(inputs) != ticks:
+        raise ReplayError(f"{path}: expected {ticks} ticks, found {len(inputs)}")
+    config = {
+        "COLLISION_MODE": collision_mode.rstrip(b"\0").decode("ascii"),
+        "SWEPT_COLLISIONS": swept,
+        "ENTITY_BACKEND": backend.rstrip(b"\0").decode("ascii"),
+    }
+    return Replay(seed, inputs, final_score, config)
+
+
+def main():
+    import argparse
+
+    # Imported here: headless switches SDL to the dummy video driver, which
+    # must not happen when the game itself imports this module
+    import headless
+
+    parser = argparse.ArgumentParser(description="Re-run a replay headless at full speed")
+    parser.add_argument("replay", help="replay file written with --record")
+    args = parser.parse_args()
+
+    try:
+        replay = load_replay(args.replay)
+    except (OSError, ReplayError) as e:
+        parser.error(str(e))
+    # Run under the settings the game was recorded with
+    for name, value in replay.config.items():
+        setattr(headless.game, name, value)
+    state = headless.game.GameState(replay.seed)
+    result = headless.run_headless(len(replay), lambda state: replay[state.tick], state)
+    print(f"{result['ticks']} ticks, score {result['score']}, "
+          f"{result['ticks_per_sec']:.0f} ticks/sec")
+    if replay.final_score >= 0 and result["score"] != replay.final_score:
+        print(f"MISMATCH: recorded score was {replay.final_score}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
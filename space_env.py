@@ -0,0 +1,323 @@
+# Gym-Style Environments
+# SpaceGameEnv wraps one Tutorial 5 game (GameState + step_simulation)
+# behind the usual reset()/step() API for bots and training code, with no
+# window and no real-time clock. VectorSpaceEnv steps many independent
+# games in lockstep with the game rules rewritten as NumPy array
+# operations, and returns every game's observation as one batch.
+#
+# Both follow the Gymnasium conventions without depending on it:
+#   obs, info = env.reset(seed)
+#   obs, reward, terminated, truncated, info = env.step(action)
+#
+#   python space_env.py --envs 1024 --steps 500    # throughput check
+
+import os
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import math
+import random
+import time
+
+import main_tutorial5 as game
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- Actions ---
+# Discrete action index -> INPUT_* bits
+ACTIONS = [
+    0,
+    game.INPUT_LEFT,
+    game.INPUT_RIGHT,
+    game.INPUT_FIRE,
+    game.INPUT_LEFT | game.INPUT_FIRE,
+    game.INPUT_RIGHT | game.INPUT_FIRE,
+]
+
+# --- Observation ---
+# [player centre x, then for the OBS_ENEMIES lowest enemies:
+#  (x offset from the player, bottom edge, present flag)], all scaled to 0-1
+OBS_ENEMIES = 8
+OBS_SIZE = 1 + 3 * OBS_ENEMIES
+
+# --- Rewards ---
+KILL_REWARD = 1.0
+TICK_REWARD = 0.01  # for every tick survived
+DEATH_PENALTY = 10.0
+
+DEFAULT_MAX_TICKS = game.SIM_RATE * 300
+FAR = 16000  # x of unused slots in the collision test (fits int16 differences)
+
+
+def observe(state):
+    """Observation vector of one GameState, as a list of floats"""
+    player = state.player_rect
+    obs = [player.centerx / game.SCREEN_WIDTH]
+    lowest = sorted(state.enemies, key=lambda enemy: enemy.bottom, reverse=True)
+    for enemy in lowest[:OBS_ENEMIES]:
+        obs.extend(((enemy.centerx - player.centerx) / game.SCREEN_WIDTH,
+                    enemy.bottom / game.SCREEN_HEIGHT, 1.0))
+    obs.extend([0.0] * (OBS_SIZE - len(obs)))
+    return obs
+
+
+class SpaceGameEnv:
+    """One game; actions are indexes into ACTIONS"""
+
+    def __init__(self, max_ticks=DEFAULT_MAX_TICKS, frame_skip=1):
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.num_actions = len(ACTIONS)
+        self.obs_size = OBS_SIZE
+        self.state = None
+
+    def _obs(self):
+        obs = observe(self.state)
+        return np.array(obs, dtype=np.float32) if np is not None else obs
+
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        self.state = game.GameState(seed)
+        return self._obs(), {"seed": self.state.seed}
+
+    def step(self, action):
+        """Play action for frame_skip ticks; returns (obs, reward, terminated, truncated, info)"""
+        state = self.state
+        inputs = ACTIONS[action]
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            score = state.score
+            game.step_simulation(state, inputs)
+            reward += (state.score - score) * KILL_REWARD + TICK_REWARD
+            if state.game_over:
+                reward -= DEATH_PENALTY
+                break
+        terminated = state.game_over
+        truncated = not terminated and state.tick >= self.max_ticks
+        return self._obs(), reward, terminated, truncated, {"score": state.score, "tick": state.tick}
+
+
+class VectorSpaceEnv:
+    """num_envs games stepped together as NumPy arrays.
+
+    Same constants, movement, spawn timing and scoring as step_simulation,
+    but the games are not tick-for-tick copies of SpaceGameEnv:
+      - spawn positions come from the env's own NumPy RNG
+      - a bullet overlapping several asteroids takes the lowest free slot,
+        not the first asteroid in the game's container order
+      - when two bullets hit one asteroid on the same tick, the second
+        isn't retried against the other asteroids it overlaps; it survives
+    Given the same spawn positions the two agree exactly until a tick on
+    which a bullet overlaps two or more asteroids; after that they can
+    diverge. Finished games are reset automatically; their final scores
+    are reported in info["final_score"].
+    """
+
+    def __init__(self, num_envs, max_ticks=DEFAULT_MAX_TICKS, frame_skip=1, seed=None):
+        if np is None:
+            raise RuntimeError("VectorSpaceEnv needs NumPy")
+        self.num_envs = num_envs
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.num_actions = len(ACTIONS)
+        self.obs_size = OBS_SIZE
+        self.rng = np.random.default_rng(seed)
+        self.action_bits = np.array(ACTIONS, dtype=np.int32)
+
+        # Enough slots that nothing is ever dropped: the most entities that
+        # can be on screen at once with the current constants
+        self.max_bullets = math.ceil((game.SCREEN_HEIGHT + game.BULLET_HEIGHT) / game.BULLET_SPEED) + 1
+        enemy_life = math.ceil((game.SCREEN_HEIGHT + game.ENEMY_HEIGHT) / game.ENEMY_SPEED) + 1
+        self.max_enemies = math.ceil(enemy_life / game.SPAWN_RATE_MIN) + 1
+
+        n = num_envs
+        self.player_x = np.zeros(n, dtype=np.float64)
+        self.enemy_x = np.zeros((n, self.max_enemies), dtype=np.int32)
+        self.enemy_y = np.zeros((n, self.max_enemies), dtype=np.int32)
+        self.enemy_alive = np.zeros((n, self.max_enemies), dtype=bool)
+        self.bullet_x = np.zeros((n, self.max_bullets), dtype=np.int32)
+        self.bullet_y = np.zeros((n, self.max_bullets), dtype=np.int32)
+        self.bullet_alive = np.zeros((n, self.max_bullets), dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.spawn_timer = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int32)
+        self.player_top = game.SCREEN_HEIGHT - game.PLAYER_HEIGHT - 10
+        self.rows = np.arange(n)
+
+    def _reset_envs(self, mask):
+        self.player_x[mask] = game.SCREEN_WIDTH // 2 - game.PLAYER_WIDTH // 2
+        self.enemy_alive[mask] = False
+        self.bullet_alive[mask] = False
+        self.score[mask] = 0
+        self.spawn_timer[mask] = 0
+        self.ticks[mask] = 0
+
+    def reset(self, seed=None):
+        """Start every game over; returns (observations, info)"""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(slice(None))
+        return self.observe(), {}
+
+    def _first_free(self, alive, wanted):
+        """Rows that want a new entity and have room, and the slot each gets"""
+        free = ~alive
+        slot = free.argmax(axis=1)
+        rows = np.nonzero(wanted & free[self.rows, slot])[0]
+        return rows, slot[rows]
+
+    def _tick(self, bits, active):
+        """One simulation tick for the active games; returns who died"""
+        # Shooting (from the position before this tick's move)
+        rows, slot = self._first_free(self.bullet_alive, active & (bits & game.INPUT_FIRE != 0))
+        self.bullet_x[rows, slot] = self.player_x[rows].astype(np.int32) + game.PLAYER_WIDTH // 2 - game.BULLET_WIDTH // 2
+        self.bullet_y[rows, slot] = self.player_top
+        self.bullet_alive[rows, slot] = True
+
+        # Player movement
+        left = active & (bits & game.INPUT_LEFT != 0) & (self.player_x > 0)
+        self.player_x[left] -= game.PLAYER_SPEED
+        right = active & (bits & game.INPUT_RIGHT != 0) & (self.player_x + game.PLAYER_WIDTH < game.SCREEN_WIDTH)
+        self.player_x[right] += game.PLAYER_SPEED
+
+        # Spawning, faster as the score goes up
+        self.spawn_timer += active
+        rate = np.maximum(game.SPAWN_RATE_MIN, game.SPAWN_RATE_START - self.score // game.SPAWN_RATE_DIVISOR)
+        due = active & (self.spawn_timer >= rate)
+        rows, slot = self._first_free(self.enemy_alive, due)
+        self.enemy_x[rows, slot] = self.rng.integers(0, game.SCREEN_WIDTH - game.ENEMY_WIDTH + 1, len(rows))
+        self.enemy_y[rows, slot] = -game.ENEMY_HEIGHT
+        self.enemy_alive[rows, slot] = True
+        self.spawn_timer[due] = 0
+
+        # Movement and culling
+        step = active[:, None]
+        self.enemy_y += game.ENEMY_SPEED * step
+        self.enemy_alive &= self.enemy_y <= game.SCREEN_HEIGHT
+        self.bullet_y -= game.BULLET_SPEED * step
+        self.bullet_alive &= self.bullet_y + game.BULLET_HEIGHT >= 0
+
+        # Bullets vs enemies: each bullet takes the first enemy slot it overlaps.
+        # Per axis, a < x < b is tested as one unsigned compare of x - a - 1
+        # (int16 to halve the memory traffic), and dead slots are parked
+        # FAR off screen so no alive masks are needed in the big arrays
+        bx = np.where(self.bullet_alive & step, self.bullet_x + game.BULLET_WIDTH - 1, -FAR).astype(np.int16)
+        by = (self.bullet_y + game.BULLET_HEIGHT - 1).astype(np.int16)
+        ex = np.where(self.enemy_alive, self.enemy_x, FAR).astype(np.int16)
+        ey = self.enemy_y.astype(np.int16)
+        # Slots fill from the front, so columns past the last one in use
+        # anywhere can be skipped
+        used = np.nonzero(self.bullet_alive.any(axis=0))[0]
+        bullet_cols = used[-1] + 1 if len(used) else 0
+        bx, by = bx[:, :bullet_cols], by[:, :bullet_cols]
+        # overlap is (game, enemy, bullet) so the reduction runs over whole rows
+        diff = np.subtract(bx[:, None, :], ex[:, :, None], dtype=np.int16)
+        overlap = np.less(diff.view(np.uint16), game.ENEMY_WIDTH + game.BULLET_WIDTH - 1)
+        np.subtract(by[:, None, :], ey[:, :, None], out=diff)
+        overlap &= diff.view(np.uint16) < game.ENEMY_HEIGHT + game.BULLET_HEIGHT - 1
+        rows, bullets = np.nonzero(overlap.any(axis=1))
+        if len(rows):
+            targets = overlap[rows, :, bullets].argmax(axis=1)
+            _, first = np.unique(rows * self.max_enemies + targets, return_index=True)
+            rows, bullets, targets = rows[first], bullets[first], targets[first]
+            self.enemy_alive[rows, targets] = False
+            self.bullet_alive[rows, bullets] = False
+            kills = np.bincount(rows, minlength=self.num_envs)
+        else:
+            kills = np.zeros(self.num_envs, dtype=np.int64)
+        self.score += kills
+
+        # Player vs enemies
+        px = self.player_x.astype(np.int32)[:, None]
+        hit = ((self.enemy_x < px + game.PLAYER_WIDTH) & (self.enemy_x + game.ENEMY_WIDTH > px)
+               & (self.enemy_y < self.player_top + game.PLAYER_HEIGHT)
+               & (self.enemy_y + game.ENEMY_HEIGHT > self.player_top)
+               & self.enemy_alive).any(axis=1) & active
+        self.ticks += active
+        return kills, hit
+
+    def step(self, actions):
+        """Play one action per game; returns batched (obs, reward, terminated, truncated, info)"""
+        bits = self.action_bits[np.asarray(actions)]
+        active = np.ones(self.num_envs, dtype=bool)
+        reward = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        for _ in range(self.frame_skip):
+            kills, hit = self._tick(bits, active)
+            reward += kills * KILL_REWARD + active * TICK_REWARD - hit * DEATH_PENALTY
+            terminated |= hit
+            active &= ~hit
+        truncated = ~terminated & (self.ticks >= self.max_ticks)
+        done = terminated | truncated
+        info = {"score": self.score.copy(), "tick": self.ticks.copy()}
+        if done.any():
+            info["final_score"] = np.where(done, self.score, -1)
+            self._reset_envs(done)
+        return self.observe(), reward, terminated, truncated, info
+
+    def observe(self):
+        """(num_envs, OBS_SIZE) float32 observations, laid out like observe()"""
+        n = self.num_envs
+        obs = np.zeros((n, OBS_SIZE), dtype=np.float32)
+        player_cx = self.player_x.astype(np.int32) + game.PLAYER_WIDTH // 2
+        obs[:, 0] = player_cx / game.SCREEN_WIDTH
+
+        # The lowest OBS_ENEMIES live enemies of every game
+        bottom = np.where(self.enemy_alive, self.enemy_y + game.ENEMY_HEIGHT, -FAR)
+        k = min(OBS_ENEMIES, self.max_enemies)
+        order = np.argsort(-bottom, axis=1, kind="stable")[:, :k]
+        rows = self.rows[:, None]
+        present = self.enemy_alive[rows, order]
+        centre = self.enemy_x[rows, order] + game.ENEMY_WIDTH // 2
+        obs[:, 1:1 + 3 * k:3] = np.where(present, (centre - player_cx[:, None]) / game.SCREEN_WIDTH, 0.0)
+        obs[:, 2:2 + 3 * k:3] = np.where(present, bottom[rows, order] / game.SCREEN_HEIGHT, 0.0)
+        obs[:, 3:3 + 3 * k:3] = present
+        return obs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure environment throughput with random actions")
+    parser.add_argument("--envs", type=int, default=1024, help="games in the vectorized env")
+    parser.add_argument("--steps", type=int, default=500, help="vectorized steps to run")
+    parser.add_argument("--single-steps", type=int, default=20000, help="steps for the single env")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    env = SpaceGameEnv()
+    env.reset(args.seed)
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(args.single_steps):
+        _, _, terminated, truncated, _ = env.step(rng.randrange(env.num_actions))
+        if terminated or truncated:
+            episodes += 1
+            env.reset()
+    elapsed = time.perf_counter() - start
+    print(f"SpaceGameEnv:    {args.single_steps / elapsed:10.0f} steps/s ({episodes} episodes)")
+
+    if np is None:
+        print("VectorSpaceEnv: skipped (NumPy is not installed)")
+        return
+    venv = VectorSpaceEnv(args.envs, seed=args.seed)
+    venv.reset()
+    action_rng = np.random.default_rng(args.seed)
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        actions = action_rng.integers(0, venv.num_actions, args.envs)
+        _, _, terminated, truncated, _ = venv.step(actions)
+        episodes += int(np.count_nonzero(terminated | truncated))
+    elapsed = time.perf_counter() - start
+    print(f"VectorSpaceEnv:  {args.steps * args.envs / elapsed:10.0f} steps/s "
+          f"({args.envs} games, {episodes} episodes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Spatial Hash Broadphase
+# Buckets enemy rects into a uniform grid so each bullet is only tested
+# against the enemies that share a cell with it.
+
+# --- Constants ---
+DEFAULT_CELL_SIZE = 64
+
+
+class SpatialHash:
+    """Uniform grid of cells mapping (cx, cy) -> list of item indices"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        """Drop every bucket (call once per frame before re-inserting)"""
+        self.cells.clear()
+
+    def cell_range(self, rect):
+        """Return the (x0, y0, x1, y1) cell span covered by a rect"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, index, rect):
+        """Add an item index to every cell its rect overlaps"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+
+    def build(self, rects):
+        """Rebuild the grid from a sequence of rects"""
+        self.clear()
+        for index, rect in enumerate(rects):
+            self.insert(index, rect)
+
+    def query(self, rect):
+        """Return the set of item indices sharing a cell with rect"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+
+def remove_indices(items, dead):
+    """Remove every index in dead from items, keeping the original order"""
+    if not dead:
+        return
+    if hasattr(items, "remove_indices"):
+        items.remove_indices(dead)
+    else:
+        items[:] = [item for i, item in enumerate(items) if i not in dead]
+
+
+def check_bullet_enemy_collision_hashed(bullets, enemies, grid=None):
+    """Spatial-hash version of check_bullet_enemy_collision.
+
+    Same result as the brute-force loop: bullets are processed in order and
+    each one destroys the first live enemy (in list order) it overlaps.
+    Returns the score increase.
+    """
+    if not bullets or not enemies:
+        return 0
+    if grid is None:
+        grid = SpatialHash()
+
+    enemy_list = list(enemies)
+    grid.build(enemy_list)
+
+    dead_bullets = set()
+    dead_enemies = set()
+    for b, bullet in enumerate(bullets):
+        hit = None
+        for e in grid.query(bullet):
+            if e in dead_enemies or (hit is not None and e > hit):
+                continue
+            if bullet.colliderect(enemy_list[e]):
+                hit = e
+        if hit is not None:
+            dead_bullets.add(b)
+            dead_enemies.add(hit)
+
+    remove_indices(bullets, dead_bullets)
+    remove_indices(enemies, dead_enemies)
+    return len(dead_enemies)
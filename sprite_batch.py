@@ -0,0 +1,56 @@
+# Sprite Batching
+# Collects (surface, position) pairs for a frame and submits them with a
+# single Surface.blits call, plus helpers that pre-bake the rectangle
+# looks (filled box + border, bullet + glow) into surfaces so they can be
+# batched like images.
+
+import pygame
+
+
+def make_box_sprite(width, height, fill, border, border_width=1):
+    """Return a surface of a filled box with a border drawn inside its edge"""
+    sprite = pygame.Surface((width, height))
+    sprite.fill(fill)
+    pygame.draw.rect(sprite, border, sprite.get_rect(), border_width)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite
+
+
+def make_glow_sprite(width, height, fill, glow):
+    """Return a (width + 2) x (height + 2) surface: a filled box with a 1px glow around it.
+
+    Blit it at (x - 1, y - 1) to match drawing the box at (x, y) and its
+    outline one pixel outside.
+    """
+    sprite = pygame.Surface((width + 2, height + 2))
+    sprite.fill(glow)
+    sprite.fill(fill, (1, 1, width, height))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite
+
+
+class SpriteBatch:
+    """A frame's worth of blits submitted in one Surface.blits call"""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, surface, position):
+        """Queue one blit"""
+        self.items.append((surface, position))
+
+    def add_rects(self, surface, rects, offset=(0, 0)):
+        """Queue surface at the top-left of every rect (shifted by offset)"""
+        dx, dy = offset
+        if dx or dy:
+            self.items.extend([(surface, (rect.x + dx, rect.y + dy)) for rect in rects])
+        else:
+            self.items.extend([(surface, rect) for rect in rects])
+
+    def draw(self, screen):
+        """Blit everything queued this frame and empty the batch"""
+        if self.items:
+            screen.blits(self.items, doreturn=False)
+            self.items = []
@@ -0,0 +1,83 @@
+# Starfield
+# Parallax star background made of pre-rendered layers. Each layer's stars
+# are drawn once into a surface twice the screen height (the same tile
+# stacked twice), and scrolling is just a change of the source area, so a
+# frame costs one blit per layer no matter how many stars there are.
+
+import random
+
+import pygame
+
+# --- Constants ---
+# (speed in pixels per frame, number of stars, color, radius)
+DEFAULT_LAYERS = [
+    (0.5, 100, (110, 110, 110), 1),
+    (1, 150, (200, 200, 200), 1),
+    (2, 30, (255, 255, 255), 2),
+]
+TRANSPARENT = (0, 0, 0)
+
+
+class StarLayer:
+    """One pre-rendered, vertically tiling layer of stars"""
+
+    def __init__(self, width, height, speed, count, color, radius=1, rng=random):
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.offset = 0.0
+
+        tile = pygame.Surface((width, height))
+        tile.fill(TRANSPARENT)
+        for _ in range(count):
+            x = rng.randint(0, width)
+            y = rng.randint(0, height)
+            pygame.draw.circle(tile, color, (x, y), radius)
+            # Stars touching an edge are drawn again on the opposite edge
+            # so the seam between tiles is invisible
+            if y < radius:
+                pygame.draw.circle(tile, color, (x, y + height), radius)
+            elif y > height - radius:
+                pygame.draw.circle(tile, color, (x, y - height), radius)
+
+        self.surface = pygame.Surface((width, height * 2))
+        self.surface.blit(tile, (0, 0))
+        self.surface.blit(tile, (0, height))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        # RLE skips the transparent runs instead of testing every pixel
+        self.surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+
+    def update(self, frames=1):
+        """Scroll the layer down"""
+        self.offset = (self.offset + self.speed * frames) % self.height
+
+    def draw(self, screen):
+        """Blit the visible window of the tiled surface"""
+        top = self.height - int(self.offset)
+        screen.blit(self.surface, (0, 0), (0, top, self.width, self.height))
+
+
+class Starfield:
+    """Stack of StarLayers drawn back to front"""
+
+    def __init__(self, width, height, layers=DEFAULT_LAYERS, rng=random):
+        self.layers = [StarLayer(width, height, speed, count, color, radius, rng)
+                       for speed, count, color, radius in layers]
+
+    def update(self, frames=1):
+        """Scroll every layer at its own speed"""
+        for layer in self.layers:
+            layer.update(frames)
+
+    def draw(self, screen, detail=1.0):
+        """Draw the layers onto the screen.
+
+        With detail < 1 only that fraction of the layers is drawn, dropping
+        the back (faintest) ones first.
+        """
+        layers = self.layers
+        if detail < 1.0:
+            layers = layers[-max(1, int(len(layers) * detail)):]
+        for layer in layers:
+            layer.draw(screen)
@@ -0,0 +1,72 @@
+# Vectorized Starfield
+# Stars stored as NumPy arrays: one vectorized step moves and wraps all of
+# them (stars that fall off the bottom get new columns in one batched
+# random draw) and one fancy-indexed assignment plots them into the
+# screen's pixels through pygame.surfarray. Suitable for very large star
+# counts where even pre-rendered layers would need regenerating.
+
+import numpy as np
+import pygame
+
+# --- Constants ---
+# (speed in pixels per frame, number of stars, color, radius); radius is
+# ignored here, every star is a single pixel
+DEFAULT_LAYERS = [
+    (0.5, 100, (110, 110, 110), 1),
+    (1, 150, (200, 200, 200), 1),
+    (2, 30, (255, 255, 255), 1),
+]
+
+
+class VectorStarfield:
+    """All stars of every layer in flat x/y/speed/color arrays"""
+
+    def __init__(self, width, height, layers=DEFAULT_LAYERS, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+
+        counts = [count for _, count, _, _ in layers]
+        total = sum(counts)
+        self.x = self.rng.integers(0, width, total, dtype=np.int32)
+        self.y = self.rng.uniform(0, height, total).astype(np.float32)
+        self.speed = np.repeat(np.array([speed for speed, _, _, _ in layers], dtype=np.float32), counts)
+        self.layer = np.repeat(np.arange(len(layers), dtype=np.int32), counts)
+        self.colors = [color for _, _, color, _ in layers]
+        self._mapped = None
+        self._mapped_format = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def update(self, frames=1):
+        """Move every star down and wrap the ones that left the screen"""
+        self.y += self.speed * frames
+        wrapped = self.y >= self.height
+        count = int(np.count_nonzero(wrapped))
+        if count:
+            self.y[wrapped] -= self.height
+            self.x[wrapped] = self.rng.integers(0, self.width, count, dtype=np.int32)
+
+    def _mapped_colors(self, screen):
+        """Per-star pixel values in the screen's format (cached)"""
+        surface_format = (screen.get_bitsize(), screen.get_masks())
+        if self._mapped_format != surface_format:
+            layer_pixels = np.array([screen.map_rgb(color) for color in self.colors], dtype=np.uint32)
+            self._mapped = layer_pixels[self.layer]
+            self._mapped_format = surface_format
+        return self._mapped
+
+    def draw(self, screen, detail=1.0):
+        """Plot the stars straight into the screen's pixel array.
+
+        With detail < 1 only that fraction of the stars is plotted, dropping
+        the back layers first.
+        """
+        colors = self._mapped_colors(screen)
+        first = len(self.x) - int(len(self.x) * detail) if detail < 1.0 else 0
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            pixels[self.x[first:], self.y[first:].astype(np.int32)] = colors[first:]
+        finally:
+            del pixels  # unlock the surface
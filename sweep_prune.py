@@ -0,0 +1,112 @@
+# Sweep and Prune Collision
+# Enemies only move down and bullets only move up, so their x intervals
+# never change once spawned. The engine keeps enemies sorted by left edge,
+# reusing last frame's order so the re-sort is nearly linear (Timsort on
+# almost-sorted data). Each bullet then binary-searches the enemies whose x
+# interval can overlap its own, and only those candidate pairs get a
+# vertical test.
+#
+# The vertical test can be swept: given how far bullets and enemies moved
+# towards each other this step, a bullet that passed completely through an
+# enemy between two frames still counts as a hit.
+
+from bisect import bisect_right
+
+from spatial_hash import remove_indices
+
+
+class SweepAndPrune:
+    """Keeps enemies sorted along x between frames and yields candidate pairs"""
+
+    def __init__(self):
+        self.order = []  # enemy rects sorted by left edge, from last frame
+
+    def sort_enemies(self, enemies):
+        """Return (index, rect) pairs sorted by left edge, reusing last frame's order"""
+        index_of = {id(rect): i for i, rect in enumerate(enemies)}
+        kept = [rect for rect in self.order if id(rect) in index_of]
+        kept_ids = {id(rect) for rect in kept}
+        kept.extend(rect for rect in enemies if id(rect) not in kept_ids)
+        kept.sort(key=lambda rect: rect.left)  # nearly sorted, so close to O(n)
+        self.order = kept
+        return [(index_of[id(rect)], rect) for rect in kept]
+
+    def candidate_pairs(self, bullets, enemies):
+        """Yield (bullet index, enemy index, bullet, enemy) for overlapping x intervals"""
+        if not enemies:
+            return
+        ordered = self.sort_enemies(enemies)
+        lefts = [rect.left for _, rect in ordered]
+        max_width = max(rect.width for _, rect in ordered)
+
+        for b, bullet in enumerate(bullets):
+            # Enemies starting at or before (bullet.left - max_width) end before the bullet
+            start = bisect_right(lefts, bullet.left - max_width)
+            for k in range(start, len(ordered)):
+                e, enemy = ordered[k]
+                if enemy.left >= bullet.right:
+                    break
+                if enemy.right > bullet.left:
+                    yield b, e, bullet, enemy
+
+
+def vertical_overlap(bullet, enemy, sweep=0):
+    """True if bullet and enemy overlap vertically, counting sweep pixels of travel.
+
+    sweep is how far the bullet moved up relative to the enemy during the
+    last step (bullet speed + enemy speed); the bullet's previous position
+    was that far further down.
+    """
+    return bullet.top < enemy.bottom and bullet.bottom + sweep > enemy.top
+
+
+def check_bullet_enemy_collision_sap(bullets, enemies, engine=None, sweep=0):
+    """Sweep-and-prune version of check_bullet_enemy_collision.
+
+    Bullets are processed in order and each destroys the first live enemy
+    (in container order) it overlaps, as in the brute-force loop. With
+    sweep > 0 overlaps are tested along the path travelled this step, so
+    fast bullets can't tunnel through enemies. Returns the score increase.
+    """
+    if not bullets or not enemies:
+        return 0
+    if engine is None:
+        engine = SweepAndPrune()
+
+    hits = {}  # bullet index -> lowest colliding enemy index
+    bullet_list = list(bullets)
+    enemy_list = list(enemies)
+    for b, e, bullet, enemy in engine.candidate_pairs(bullet_list, enemy_list):
+        if vertical_overlap(bullet, enemy, sweep):
+            if b not in hits or e < hits[b]:
+                hits[b] = e
+    if not hits:
+        return 0
+
+    # Resolve in bullet order so each enemy is only destroyed once
+    dead_bullets = set()
+    dead_enemies = set()
+    for b in sorted(hits):
+        e = hits[b]
+        if e in dead_enemies:
+            # The first choice was taken by an earlier bullet; find the next one
+            e = next_hit(bullet_list[b], enemy_list, dead_enemies, sweep)
+            if e is None:
+                continue
+        dead_bullets.add(b)
+        dead_enemies.add(e)
+
+    remove_indices(bullets, dead_bullets)
+    remove_indices(enemies, dead_enemies)
+    return len(dead_enemies)
+
+
+def next_hit(bullet, enemy_list, dead_enemies, sweep):
+    """Lowest-index live enemy the bullet overlaps (rare fallback path)"""
+    for e, enemy in enumerate(enemy_list):
+        if e in dead_enemies:
+            continue
+        if (enemy.left < bullet.right and enemy.right > bullet.left and
+                vertical_overlap(bullet, enemy, sweep)):
+            return e
+    return None
@@ -0,0 +1,71 @@
+# Text Cache
+# Creates each font once and memoizes rendered text surfaces, so HUD code
+# can ask for "Score: 12" every frame without re-rendering it.
+
+from collections import OrderedDict
+
+import pygame
+
+# --- Constants ---
+DEFAULT_MAX_ENTRIES = 256
+
+
+class TextCache:
+    """Font and rendered-surface cache with an LRU bound.
+
+    Surfaces are keyed by (font name, size, text, color). Dynamic text
+    (scores, counters) goes through render() and is evicted least recently
+    used first; static text (instructions, titles) goes through
+    render_static() and is kept for the life of the cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, antialias=True):
+        self.max_entries = max_entries
+        self.antialias = antialias
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.static_surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=None):
+        """Return a Font for (name, size), creating it on first use"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None):
+        """Return a rendered surface, re-using a cached one when possible"""
+        key = (name, size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, self.antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def render_static(self, text, size, color, name=None):
+        """Return a pre-baked surface for text that never changes"""
+        key = (name, size, text, color)
+        surface = self.static_surfaces.get(key)
+        if surface is None:
+            surface = self.get_font(size, name).render(text, self.antialias, color)
+            self.static_surfaces[key] = surface
+        return surface
+
+    def prebake(self, lines, size, color, name=None):
+        """Render a list of static lines up front and return their surfaces"""
+        return [self.render_static(line, size, color, name) for line in lines]
+
+    def clear(self):
+        """Drop every cached surface (fonts are kept)"""
+        self.surfaces.clear()
+        self.static_surfaces.clear()